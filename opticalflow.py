@@ -1,18 +1,268 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
-import json
 import os
-from PIL import Image, ImageDraw, ImageTk
-import copy
-import base64
-import io
+from PIL import Image
+import collections
 import logging
+import time
+
+# Numba is optional - without it the numeric kernels below run as plain NumPy
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
-# Configure logging for debugging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('OptiflowApp')
 
+if HAS_NUMBA:
+    @njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+    def _flow_remap_coords(flow, factor, map_x, map_y):
+        """Fill remap coordinate maps with the pixel grid displaced by factor * flow"""
+        h, w = flow.shape[0], flow.shape[1]
+        for i in range(h):
+            for j in range(w):
+                map_x[i, j] = j + flow[i, j, 0] * factor
+                map_y[i, j] = i + flow[i, j, 1] * factor
+    
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _simplify_mask(pts, tolerance, max_segment):
+        """Ramer-Douglas-Peucker: boolean mask of the points to keep in an (N, 2) polyline
+        
+        Ranges longer than max_segment are split even when straight, so the point-based
+        eraser still finds points along long lines.
+        """
+        n = pts.shape[0]
+        keep = np.zeros(n, dtype=np.bool_)
+        keep[0] = True
+        keep[n - 1] = True
+        tolerance_sq = tolerance * tolerance
+        max_segment_sq = max_segment * max_segment
+        
+        # Explicit stack of (first, last) index ranges still to be checked
+        stack = np.empty((n, 2), dtype=np.int64)
+        stack[0, 0] = 0
+        stack[0, 1] = n - 1
+        top = 1
+        while top > 0:
+            top -= 1
+            first = stack[top, 0]
+            last = stack[top, 1]
+            x0 = pts[first, 0]
+            y0 = pts[first, 1]
+            dx = pts[last, 0] - x0
+            dy = pts[last, 1] - y0
+            seg_len_sq = dx * dx + dy * dy
+            
+            # Find the point furthest from the chord between first and last
+            max_dist_sq = -1.0
+            index = first
+            for i in range(first + 1, last):
+                px = pts[i, 0] - x0
+                py = pts[i, 1] - y0
+                if seg_len_sq > 0.0:
+                    cross = px * dy - py * dx
+                    dist_sq = cross * cross / seg_len_sq
+                else:
+                    dist_sq = px * px + py * py
+                if dist_sq > max_dist_sq:
+                    max_dist_sq = dist_sq
+                    index = i
+            
+            # Keep it and check both halves if it is too far to drop
+            if max_dist_sq <= tolerance_sq and seg_len_sq > max_segment_sq and last - first > 1:
+                index = (first + last) // 2
+                max_dist_sq = tolerance_sq + 1.0
+            if max_dist_sq > tolerance_sq:
+                keep[index] = True
+                stack[top, 0] = first
+                stack[top, 1] = index
+                stack[top + 1, 0] = index
+                stack[top + 1, 1] = last
+                top += 2
+        return keep
+    
+    @njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+    def _snap_interp(start, end, binary, canvas_w, canvas_h, factor, radius):
+        """Blend two equal-length strokes and pull each point toward the stroke pixels around it"""
+        n = start.shape[0]
+        h, w = binary.shape[0], binary.shape[1]
+        out = np.empty((n, 2), dtype=np.float64)
+        
+        # Per-call constants: canvas/image scales and the clamp limits for the window center
+        to_img_x = w / canvas_w
+        to_img_y = h / canvas_h
+        to_canvas_x = canvas_w / w
+        to_canvas_y = canvas_h / h
+        max_x = w - radius - 1
+        max_y = h - radius - 1
+        for k in range(n):
+            bx = (1.0 - factor) * np.float64(start[k, 0]) + factor * np.float64(end[k, 0])
+            by = (1.0 - factor) * np.float64(start[k, 1]) + factor * np.float64(end[k, 1])
+            out[k, 0] = bx
+            out[k, 1] = by
+            
+            # Pixel position, clamped so the search window stays inside the image
+            img_x = min(max(int(bx * to_img_x), radius), max_x)
+            img_y = min(max(int(by * to_img_y), radius), max_y)
+            
+            # Image moments of the window: stroke pixel count and their offset sums
+            m00 = 0
+            m10 = 0
+            m01 = 0
+            for dy in range(-radius, radius + 1):
+                for dx in range(-radius, radius + 1):
+                    if binary[img_y + dy, img_x + dx] > 0:
+                        m00 += 1
+                        m10 += dx
+                        m01 += dy
+            
+            # Blend the center of mass (in canvas coordinates) with the interpolation
+            if m00 > 0:
+                out[k, 0] = 0.7 * ((img_x + m10 / m00) * to_canvas_x) + 0.3 * bx
+                out[k, 1] = 0.7 * ((img_y + m01 / m00) * to_canvas_y) + 0.3 * by
+        return out
+else:
+    def _flow_remap_coords(flow, factor, map_x, map_y):
+        """Fill remap coordinate maps with the pixel grid displaced by factor * flow"""
+        h, w = flow.shape[:2]
+        np.multiply(flow[..., 0], factor, out=map_x)
+        map_x += np.arange(w, dtype=np.float32)
+        np.multiply(flow[..., 1], factor, out=map_y)
+        map_y += np.arange(h, dtype=np.float32)[:, None]
+
+    def _simplify_mask(pts, tolerance, max_segment):
+        """Ramer-Douglas-Peucker: boolean mask of the points to keep in an (N, 2) polyline
+        
+        Ranges longer than max_segment are split even when straight, so the point-based
+        eraser still finds points along long lines.
+        """
+        n = len(pts)
+        keep = np.zeros(n, dtype=bool)
+        keep[0] = keep[-1] = True
+        tolerance_sq = tolerance * tolerance
+        max_segment_sq = max_segment * max_segment
+        
+        # Explicit stack of (first, last) index ranges still to be checked
+        stack = [(0, n - 1)]
+        while stack:
+            first, last = stack.pop()
+            if last - first < 2:
+                continue
+            
+            # Find the point furthest from the chord between first and last
+            offsets = pts[first + 1:last] - pts[first]
+            dx, dy = pts[last] - pts[first]
+            seg_len_sq = dx * dx + dy * dy
+            if seg_len_sq > 0:
+                dist_sq = (offsets[:, 0] * dy - offsets[:, 1] * dx)**2 / seg_len_sq
+            else:
+                dist_sq = (offsets**2).sum(axis=1)
+            i = int(np.argmax(dist_sq))
+            
+            # Keep it and check both halves if it is too far to drop
+            if dist_sq[i] > tolerance_sq or seg_len_sq > max_segment_sq:
+                index = first + 1 + i if dist_sq[i] > tolerance_sq else (first + last) // 2
+                keep[index] = True
+                stack.append((first, index))
+                stack.append((index, last))
+        return keep
+    
+    def _snap_interp(start, end, binary, canvas_w, canvas_h, factor, radius):
+        """Blend two equal-length strokes and pull each point toward the stroke pixels around it"""
+        blended = (1 - factor) * start.astype(np.float64) + factor * end.astype(np.float64)
+        out = blended.copy()
+        
+        # Pixel position of each point, clamped so the search window stays inside the image
+        h, w = binary.shape[:2]
+        img_xs = np.clip((blended[:, 0] * w / canvas_w).astype(np.int64), radius, w-radius-1)
+        img_ys = np.clip((blended[:, 1] * h / canvas_h).astype(np.int64), radius, h-radius-1)
+        
+        # Gather the window around every point in one fancy-indexing pass
+        offsets = np.arange(-radius, radius + 1)
+        regions = binary[img_ys[:, None, None] + offsets[None, :, None],
+                         img_xs[:, None, None] + offsets[None, None, :]] > 0
+        
+        # Image moments of each window from its row and column projections:
+        # pixel count and offset sums as dot products, no per-pixel coordinate arrays
+        col_counts = regions.sum(axis=1)
+        row_counts = regions.sum(axis=2)
+        m00 = col_counts.sum(axis=1)
+        m10 = col_counts @ offsets
+        m01 = row_counts @ offsets
+        
+        # Blend the center of mass (in canvas coordinates) with the interpolation
+        hit = m00 > 0
+        out[hit, 0] = 0.7 * ((img_xs[hit] + m10[hit] / m00[hit]) * canvas_w / w) + 0.3 * blended[hit, 0]
+        out[hit, 1] = 0.7 * ((img_ys[hit] + m01[hit] / m00[hit]) * canvas_h / h) + 0.3 * blended[hit, 1]
+        return out
+
+def _liang_barsky(x1, y1, x2, y2, right, bottom):
+    """Liang-Barsky clip: parameter range (t_enter, t_exit) of a segment inside [0, right] x [0, bottom]
+    
+    t_enter > t_exit means the segment misses the rectangle.
+    """
+    dx = float(x2 - x1)
+    dy = float(y2 - y1)
+    t_enter = 0.0
+    t_exit = 1.0
+    
+    # Each edge is the half-plane p * t <= q
+    for p, q in ((-dx, float(x1)), (dx, float(right - x1)), (-dy, float(y1)), (dy, float(bottom - y1))):
+        if p == 0.0:
+            if q < 0.0:
+                return 1.0, 0.0  # Parallel to this edge and outside it
+        elif p < 0.0:
+            t_enter = max(t_enter, q / p)  # Crossing into the half-plane
+        else:
+            t_exit = min(t_exit, q / p)  # Crossing out of the half-plane
+    return t_enter, t_exit
+
+if HAS_NUMBA:
+    _liang_barsky = njit(cache=True)(_liang_barsky)  # Scalar-only body compiles to a small leaf function
+
+def _make_clipper(right, bottom):
+    """Build a boundary crossing function bound to the [0, right] x [0, bottom] display rectangle"""
+    def clip_segment(x1, y1, x2, y2):
+        """Where a segment crosses the rectangle edge, as a list of zero or one points"""
+        t_enter, t_exit = _liang_barsky(x1, y1, x2, y2, right, bottom)
+        if t_enter > t_exit:
+            return []  # The segment never touches the rectangle
+        
+        # Leaving the rectangle crosses at the exit parameter, entering at the entry parameter
+        t = t_exit if not (0 <= x2 < right and 0 <= y2 < bottom) else t_enter
+        return [(x1 + (x2 - x1) * t, y1 + (y2 - y1) * t)]
+    return clip_segment
+
+def _clone_strokes(strokes):
+    """Copy a stroke list for another owner - finished strokes are read-only, so they are shared"""
+    return list(strokes)
+
+def _render_export_frame(strokes, size, supersample):
+    """Render one exported frame to PNG bytes - module level so process pool workers can run it
+    
+    strokes is a list of (pts, color, width) tuples in canvas coordinates.
+    """
+    import io
+    from PIL import ImageDraw  # Only needed when exporting
+    width, height = size
+    
+    # Draw strokes with anti-aliasing by drawing at higher resolution
+    img_high_res = Image.new('RGB', (width * supersample, height * supersample), color='white')
+    draw = ImageDraw.Draw(img_high_res)
+    for pts, color, line_width in strokes:
+        # Scale coordinates to higher resolution and draw the whole stroke as one polyline
+        coords = (pts * supersample).ravel().tolist()
+        draw.line(coords, fill=color, width=line_width * supersample, joint="curve")  # Width scaled for higher resolution
+    
+    # Average each block of pixels back down to the original size
+    img = img_high_res.reduce(supersample)
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", compress_level=3)  # Much faster than the default level 6, slightly larger files
+    return buffer.getvalue()
+
 # Helper class for tooltips - moved to the top of the file to be defined before use
 class Tooltip:
     def __init__(self, widget, text):
@@ -53,17 +303,37 @@ class OptiflowApp:
         self.keyframes = {}  # Dictionary to store strokes for each keyframe
         self.current_keyframe = 1
         self.strokes = []    # Current strokes being drawn
-        self.current_stroke = []  # Points in the current stroke
+        self.stroke_items = []  # Canvas line item of each stroke in self.strokes, in the same order
+        self.current_stroke = np.empty((64, 2), dtype=np.float32)  # Growable point buffer for the current stroke
+        self.current_stroke_len = 0  # Number of points used in the buffer
+        self.live_stroke_item = None  # Canvas item showing the stroke being drawn
+        self.live_update_interval = 1 / 120  # Seconds between live stroke redraws, however fast input arrives
+        self.last_live_update = 0.0  # time.monotonic() of the last live stroke redraw
+        self.live_after_id = None  # Pending deferred live stroke redraw
         self.is_drawing = False
+        self.last_x = self.last_y = None  # Last stroke point in canvas coordinates
+        self.last_event_x = self.last_event_y = None  # Last pointer position relative to the canvas
         
         # Tool state - add tool tracking
         self.current_tool = "pencil"  # Default tool is pencil
         self.eraser_size = 20  # Size of the eraser in pixels
-        
-        # Undo/Redo history stacks
-        self.history = []  # Stack for undo operations
-        self.redo_stack = []  # Stack for redo operations
-        self.max_history = 50  # Limit history to prevent memory issues
+        self.min_point_dist_sq = 1.5  # Squared canvas-space distance a new pencil point must move
+        self.simplify_tolerance = 0.75  # Max deviation in canvas pixels when simplifying finished strokes
+        self.simplify_max_segment = self.eraser_size / 2  # Longest gap simplification leaves between points
+        
+        # Undo/Redo history stacks - operation log of deltas, not snapshots
+        self.max_history = 200  # Maximum number of operations kept for undo
+        self.history = collections.deque(maxlen=self.max_history)  # Ring buffer of applied operations for undo
+        self.redo_stack = collections.deque()  # Stack of undone operations for redo - only ever ops moved out of history, so within its limits
+        self.max_history_points = 500000  # Limit history by total stroke points held
+        self.history_points = 0  # Running point count of operations in history
+        self.erase_op = None  # Group operation collecting the current eraser drag
+        
+        # Status bar throttling - frequent messages are written at most once per interval
+        self.status_interval = 100  # Milliseconds between throttled status bar writes
+        self.status_after_id = None  # Pending end of the current throttle interval
+        self.pending_status = None  # Latest message held back during the interval
+        self.shown_status = None  # Last message written by the throttle
         
         # Canvas dimensions (actual size for rendering and export)
         self.canvas_width = 1920
@@ -81,12 +351,29 @@ class OptiflowApp:
         # Calculate display dimensions considering both scale and zoom
         self.update_display_dimensions()
         
+        # Optical flow interpolation buffers
+        self.remap_maps = None  # Reused float32 (map_x, map_y) buffers for warping
+        self.flow_downscale = 2  # Flow is computed at 1/n resolution and upsampled
+        self.flow_cache = collections.OrderedDict()  # Stroke ids of a frame pair -> start image and flow, oldest first
+        self.max_flow_cache = 4  # Frame pairs whose flow is kept (about 19 MB each)
+        self.windowing_system = self.root.tk.call('tk', 'windowingsystem')  # Read once, Tk is not used off the main thread
+        self.interpolation_executor = None  # Background thread running interpolations, created on first use
+        self.interpolation_future = None  # Interpolation currently running, if any
+        
         # Onion skinning settings
         self.show_onion_skin = True
         self.onion_skin_opacity = 30  # 0-100 (percentage)
+        self.onion_cache = collections.OrderedDict()  # Keyframe number -> stroke mask and tinted PhotoImage of the last onion layer, oldest first
+        self.max_onion_cache = 4  # Keyframes whose onion layer is kept - the two shown plus the two stepped away from
+        self.onion_after_id = None  # Pending debounced redraw for the opacity slider
+        self.slider_redraw_delay = 50  # Milliseconds the opacity slider must rest before redrawing
         
         # Clipboard storage for copy-paste
         self.clipboard = None
+        self.clipboard_text = None  # Text placed on the system clipboard by the last copy
+        self.parsed_clipboard = None  # (text, strokes) of the last clipboard text parsed by paste
+        self.clipboard_prefix = "OPTIFLOW:"  # Marks the compact binary clipboard text
+        self.max_json_clipboard_points = 20000  # Larger copies use the compact text instead of JSON
         
         # Remove the paste_with_offset option
         
@@ -94,9 +381,15 @@ class OptiflowApp:
         
         # Animation state variables
         self.animation_running = False
+        self.animation_items = []  # Canvas line items reused from one animation frame to the next
+        self.animation_shown = None  # Stroke ids of the frame currently on the canvas
+        self.animation_photos = None  # Prerendered frame images by frame number, None when drawing line items
+        self.animation_image_item = None  # Canvas image item the prerendered frames are shown in
+        self.max_animation_pixels = 32000000  # Budget for prerendered frames (Tk keeps 4 bytes per pixel)
         
         # Add pencil color property
         self.pencil_color = "#666666"  # Dark grey color
+        self.export_supersample = 2  # Exported frames are drawn at this multiple of their size, then averaged down
         
         # Set up the UI
         self.setup_ui()
@@ -111,8 +404,13 @@ class OptiflowApp:
         # Register keyboard shortcuts properly
         self.bind_shortcuts()
         
-        # Save initial state for undo
-        self.save_state()
+        # Compile the numeric kernels once the window is up so the first interpolation doesn't stall.
+        # With cache=True later launches only load the compiled code from the cache.
+        if HAS_NUMBA:
+            self.root.after_idle(self.warm_up_kernels)
+        
+        # Stop background work when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # For debugging
         logger.info("Application initialized")
@@ -120,10 +418,35 @@ class OptiflowApp:
         # Enable debug logging to get more information about onion skin rendering
         logging.getLogger('OptiflowApp').setLevel(logging.DEBUG)
     
+    def on_close(self):
+        """Stop background work and close the window"""
+        if self.interpolation_executor is not None:
+            # The executor only ever holds the one running interpolation - it cannot be
+            # interrupted, but its result is never applied once the window is gone
+            self.interpolation_executor.shutdown(wait=False)
+        self.root.destroy()
+    
+    def warm_up_kernels(self):
+        """Run the JIT-compiled kernels once on tiny inputs to trigger compilation"""
+        try:
+            flow = np.zeros((2, 2, 2), dtype=np.float32)
+            _flow_remap_coords(flow, 0.5, np.empty((2, 2), dtype=np.float32), np.empty((2, 2), dtype=np.float32))
+            _simplify_mask(np.zeros((3, 2), dtype=np.float32), 0.75, 10.0)
+            _liang_barsky(-5, 5, 5, 5, 10, 10)
+            pts = np.zeros((2, 2), dtype=np.float32)
+            pts.flags.writeable = False  # Stroke points are read-only
+            _snap_interp(pts, pts, np.zeros((11, 11), dtype=np.uint8), 10, 10, 0.5, 5)
+            logger.info("Numba kernels compiled")
+        except Exception as e:
+            logger.warning(f"Numba kernel warm-up failed: {e}")
+    
     def update_display_dimensions(self):
         """Update the display dimensions based on scale and zoom factors"""
-        self.display_width = int(self.canvas_width * self.scale_factor * self.zoom_factor)
-        self.display_height = int(self.canvas_height * self.scale_factor * self.zoom_factor)
+        self.display_scale = self.scale_factor * self.zoom_factor  # Canvas to display coordinates
+        self.inv_display_scale = 1.0 / self.display_scale  # Display to canvas coordinates
+        self.display_width = int(self.canvas_width * self.display_scale)
+        self.display_height = int(self.canvas_height * self.display_scale)
+        self.clip_segment = _make_clipper(self.display_width, self.display_height)  # Boundary crossings at this size
     
     def bind_shortcuts(self):
         """Set up keyboard shortcuts that work properly"""
@@ -195,11 +518,9 @@ class OptiflowApp:
             self.current_zoom_index += 1
             self.zoom_factor = self.zoom_levels[self.current_zoom_index]
             
-            # Update display dimensions and redraw
-            self.update_display_dimensions()
-            self.canvas.config(width=self.display_width, height=self.display_height)
-            self.redraw_canvas()
-            self.status_var.set(f"Zoom: {int(self.zoom_factor * 100)}%")
+            # Update display dimensions and rescale the canvas items
+            self.apply_zoom(old_zoom)
+            self._set_status(f"Zoom: {int(self.zoom_factor * 100)}%")
             logger.info(f"Zoomed in to {int(self.zoom_factor * 100)}%")
         else:
             self.status_var.set(f"Already at maximum zoom: {int(self.zoom_factor * 100)}%")
@@ -215,11 +536,9 @@ class OptiflowApp:
             self.current_zoom_index -= 1
             self.zoom_factor = self.zoom_levels[self.current_zoom_index]
             
-            # Update display dimensions and redraw
-            self.update_display_dimensions()
-            self.canvas.config(width=self.display_width, height=self.display_height)
-            self.redraw_canvas()
-            self.status_var.set(f"Zoom: {int(self.zoom_factor * 100)}%")
+            # Update display dimensions and rescale the canvas items
+            self.apply_zoom(old_zoom)
+            self._set_status(f"Zoom: {int(self.zoom_factor * 100)}%")
             logger.info(f"Zoomed out to {int(self.zoom_factor * 100)}%")
         else:
             self.status_var.set(f"Already at minimum zoom: {int(self.zoom_factor * 100)}%")
@@ -229,17 +548,49 @@ class OptiflowApp:
     def reset_zoom(self, event=None):
         """Reset zoom to default (1.0)"""
         if self.current_zoom_index != 0:  # If not already at default zoom
+            old_zoom = self.zoom_factor
             self.current_zoom_index = 0
             self.zoom_factor = self.zoom_levels[self.current_zoom_index]
             
-            self.update_display_dimensions()
-            self.canvas.config(width=self.display_width, height=self.display_height)
-            self.redraw_canvas()
-            self.status_var.set("Zoom reset to 100%")
+            self.apply_zoom(old_zoom)
+            self._set_status("Zoom reset to 100%")
             logger.info("Zoom reset to 100%")
         
         return "break"  # Prevent further processing
     
+    def apply_zoom(self, old_zoom):
+        """Resize the canvas for the current zoom level, rescaling existing items where possible"""
+        self.update_display_dimensions()
+        self.canvas.config(width=self.display_width, height=self.display_height)
+        
+        # Anything on the canvas besides the finished current strokes needs a full redraw
+        items = self.stroke_items
+        if self.animation_running:
+            # Frames prerendered at the old size are useless now, and the new size may not fit the budget
+            self.reset_animation_photos(len(self.keyframes))
+            self.redraw_canvas()
+            return
+        if self.is_drawing or len(items) != len(self.strokes):
+            self.redraw_canvas()
+            return
+        
+        # Let Tk transform the stroke lines in place instead of rebuilding them
+        ratio = self.zoom_factor / old_zoom
+        self.canvas.scale("stroke", 0, 0, ratio, ratio)
+        old_scale = self.scale_factor * old_zoom
+        display_scale = self.display_scale
+        for item, stroke in zip(items, self.strokes):
+            # Tk does not scale line widths, so update those that change
+            width = max(1, int(stroke["width"] * display_scale))
+            if width != max(1, int(stroke["width"] * old_scale)):
+                self.canvas.itemconfigure(item, width=width)
+        
+        # Onion skins are images, so swap in the layers rendered for this zoom level
+        self.canvas.delete("onion")
+        if self.show_onion_skin:
+            self.draw_onion_skins()
+            self.canvas.tag_lower("onion")
+    
     def set_tool(self, tool_name):
         """Switch between drawing tools"""
         prev_tool = self.current_tool
@@ -380,11 +731,6 @@ class OptiflowApp:
         ttk.Button(copy_paste_frame, text="Copy", command=self.copy_strokes, width=5).pack(side=tk.LEFT, padx=2)
         ttk.Button(copy_paste_frame, text="Paste", command=self.paste_strokes, width=5).pack(side=tk.LEFT, padx=2)
         
-        # Bind mouse events for drawing
-        self.canvas.bind("<Button-1>", self.start_stroke)
-        self.canvas.bind("<B1-Motion>", self.continue_stroke)
-        self.canvas.bind("<ButtonRelease-1>", self.end_stroke)
-        
         # Right panel - Controls
         right_frame = ttk.Frame(paned_window)
         
@@ -500,41 +846,117 @@ class OptiflowApp:
         )
         copyright_label.pack(side=tk.RIGHT, padx=(10, 0))
     
-    def save_state(self):
-        """Save current state to history stack for undo operations"""
-        # Copy the current strokes list (deep copy to ensure independent data)
-        current_state = copy.deepcopy(self.strokes)
-        
-        # Add to history stack
-        self.history.append(current_state)
+    def push_op(self, op):
+        """Record an already-applied operation on the history stack for undo
+        
+        Operations are small dicts describing the change rather than snapshots:
+            {"op": "add", "strokes": [stroke, ...]}          strokes appended at the end
+            {"op": "erase", "indices": [(i, stroke), ...]}   strokes removed, ascending i
+            {"op": "modify", "index": i, "before": stroke, "after": [stroke, ...]}
+            {"op": "group", "ops": [op, ...]}                ops applied in order
+        Strokes are never mutated once finished, so ops hold references, not copies.
+        """
+        # Add to history stack - a full deque drops its oldest item on append
+        if len(self.history) == self.history.maxlen:
+            self.history_points -= self._op_point_count(self.history[0])
+        self.history.append(op)
+        self.history_points += self._op_point_count(op)
+        self._trim_history()
         
-        # Limit history size
-        if len(self.history) > self.max_history:
-            self.history.pop(0)  # Remove oldest item
-            
-        # Clear redo stack when new state is added
-        self.redo_stack = []
+        # Clear redo stack when new operation is added
+        self.redo_stack.clear()
         
         # Update status
-        self.status_var.set(f"State saved - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
+        self._set_status(f"State saved - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
+    
+    def _trim_history(self):
+        """Limit history by the number of points it keeps alive, dropping the oldest operations"""
+        while len(self.history) > 1 and self.history_points > self.max_history_points:
+            self.history_points -= self._op_point_count(self.history.popleft())  # Remove oldest item
+    
+    def _set_status(self, text):
+        """Show a frequent status message, writing the status bar at most once per interval"""
+        if self.status_after_id is None:
+            self.status_var.set(text)
+            self.shown_status = text
+            self.status_after_id = self.root.after(self.status_interval, self._flush_status)
+        else:
+            self.pending_status = text  # Shown when the interval ends, replacing older pending text
+    
+    def _flush_status(self):
+        """End a status throttle interval, showing the message held back during it"""
+        self.status_after_id = None
+        text, self.pending_status = self.pending_status, None
+        # Don't overwrite a message that was written directly in the meantime
+        if text is not None and self.status_var.get() == self.shown_status:
+            self._set_status(text)
+    
+    def reset_history(self):
+        """Drop all undo/redo operations"""
+        self.history.clear()
+        self.redo_stack.clear()
+        self.history_points = 0
+        self.erase_op = None
+    
+    def _op_point_count(self, op):
+        """Number of stroke points referenced by an operation"""
+        kind = op["op"]
+        if kind == "add":
+            return sum(len(stroke["pts"]) for stroke in op["strokes"])
+        if kind == "erase":
+            return sum(len(stroke["pts"]) for _, stroke in op["indices"])
+        if kind == "modify":
+            return len(op["before"]["pts"]) + sum(len(stroke["pts"]) for stroke in op["after"])
+        return sum(self._op_point_count(sub_op) for sub_op in op["ops"])
+    
+    def _apply_op(self, op):
+        """Apply an operation to the current strokes in place"""
+        kind = op["op"]
+        if kind == "add":
+            self.strokes.extend(op["strokes"])
+        elif kind == "erase":
+            # Delete from the back so earlier indices stay valid
+            for i, _ in reversed(op["indices"]):
+                del self.strokes[i]
+        elif kind == "modify":
+            i = op["index"]
+            self.strokes[i:i + 1] = op["after"]
+        else:
+            for sub_op in op["ops"]:
+                self._apply_op(sub_op)
+    
+    def _revert_op(self, op):
+        """Apply the inverse of an operation to the current strokes in place"""
+        kind = op["op"]
+        if kind == "add":
+            del self.strokes[len(self.strokes) - len(op["strokes"]):]
+        elif kind == "erase":
+            for i, stroke in op["indices"]:
+                self.strokes.insert(i, stroke)
+        elif kind == "modify":
+            i = op["index"]
+            self.strokes[i:i + len(op["after"])] = [op["before"]]
+        else:
+            for sub_op in reversed(op["ops"]):
+                self._revert_op(sub_op)
     
     def undo(self, event=None):
         """Undo the last drawing action"""
-        if len(self.history) <= 1:  # Keep at least one state (initial empty state)
+        if not self.history:
             self.status_var.set("Nothing to undo")
             return
         
-        # Save current state to redo stack
-        self.redo_stack.append(self.history.pop())  # Remove current state and add to redo stack
-        
-        # Restore previous state
-        self.strokes = copy.deepcopy(self.history[-1])  # Get the last element without removing
+        # Move the last operation to the redo stack and invert it
+        op = self.history.pop()
+        self.history_points -= self._op_point_count(op)
+        self.redo_stack.append(op)
+        self._revert_op(op)
         
         # Redraw canvas
         self.redraw_canvas()
         
         # Update status
-        self.status_var.set(f"Undo - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
+        self._set_status(f"Undo - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
         return "break"  # Stop event propagation
     
     def redo(self, event=None):
@@ -543,20 +965,20 @@ class OptiflowApp:
             self.status_var.set("Nothing to redo")
             return
         
-        # Get the last redo state
-        redo_state = self.redo_stack.pop()
-        
-        # Add current state to history
-        self.history.append(copy.deepcopy(self.strokes))
-        
-        # Apply redo state
-        self.strokes = copy.deepcopy(redo_state)
+        # Move the last undone operation back to history and re-apply it
+        op = self.redo_stack.pop()
+        if len(self.history) == self.history.maxlen:
+            self.history_points -= self._op_point_count(self.history[0])
+        self.history.append(op)
+        self.history_points += self._op_point_count(op)
+        self._trim_history()
+        self._apply_op(op)
         
         # Redraw canvas
         self.redraw_canvas()
         
         # Update status
-        self.status_var.set(f"Redo - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
+        self._set_status(f"Redo - Undo stack: {len(self.history)} | Redo stack: {len(self.redo_stack)}")
         return "break"  # Stop event propagation
     
     def start_stroke(self, event):
@@ -585,20 +1007,19 @@ class OptiflowApp:
             
             # Convert mouse coordinates from display coordinates to actual canvas coordinates
             # Include both scale_factor and zoom_factor in the conversion
-            canvas_x = rel_x / (self.scale_factor * self.zoom_factor)
-            canvas_y = rel_y / (self.scale_factor * self.zoom_factor)
+            inv_scale = self.inv_display_scale
+            canvas_x = rel_x * inv_scale
+            canvas_y = rel_y * inv_scale
             
             if self.current_tool == "pencil":
                 # Create a new stroke and add the first point, ensuring it's exactly at the click location
-                self.current_stroke = [(canvas_x, canvas_y)]
+                self.current_stroke = np.empty((64, 2), dtype=np.float32)
+                self.current_stroke_len = 0
+                self.add_stroke_point(canvas_x, canvas_y)
                 self.last_x, self.last_y = canvas_x, canvas_y
                 
-                # Draw a small dot to ensure even single clicks are visible
-                self.canvas.create_oval(
-                    rel_x - 1, rel_y - 1, 
-                    rel_x + 1, rel_y + 1,
-                    fill=self.pencil_color, outline=""
-                )
+                # Show the stroke right away so even single clicks are visible
+                self.update_live_stroke()
             elif self.current_tool == "eraser":
                 # For eraser, we'll erase on each movement
                 self.erase_at_point(canvas_x, canvas_y)
@@ -608,12 +1029,13 @@ class OptiflowApp:
             self.is_drawing = True
             if self.current_tool == "pencil":
                 # Create an empty stroke that will receive points when entering canvas
-                self.current_stroke = []
+                self.current_stroke = np.empty((64, 2), dtype=np.float32)
+                self.current_stroke_len = 0
                 
                 # Store last coordinates for boundary calculation
                 # These are outside the canvas but we need them to calculate edge intersection
-                canvas_x = rel_x / (self.scale_factor * self.zoom_factor)
-                canvas_y = rel_y / (self.scale_factor * self.zoom_factor)
+                canvas_x = rel_x * self.inv_display_scale
+                canvas_y = rel_y * self.inv_display_scale
                 self.last_x, self.last_y = canvas_x, canvas_y
     
     def continue_stroke(self, event):
@@ -636,7 +1058,10 @@ class OptiflowApp:
             rel_y = event.y - canvas_y0
         
         # Store latest event positions for potential edge calculations
-        prev_event_x, prev_event_y = getattr(self, 'last_event_x', rel_x), getattr(self, 'last_event_y', rel_y)
+        if self.last_event_x is None:
+            prev_event_x, prev_event_y = rel_x, rel_y
+        else:
+            prev_event_x, prev_event_y = self.last_event_x, self.last_event_y
         self.last_event_x, self.last_event_y = rel_x, rel_y
         
         # Check if the movement crossed the canvas boundary
@@ -644,16 +1069,22 @@ class OptiflowApp:
         current_in_canvas = (0 <= rel_x < self.display_width and 0 <= rel_y < self.display_height)
         
         # Convert mouse coordinates, considering both scale and zoom factors
-        canvas_x = rel_x / (self.scale_factor * self.zoom_factor)
-        canvas_y = rel_y / (self.scale_factor * self.zoom_factor)
+        inv_scale = self.inv_display_scale
+        canvas_x = rel_x * inv_scale
+        canvas_y = rel_y * inv_scale
         
         # Limit coordinates for visual display purposes
         display_x = max(min(rel_x, self.display_width-1), 0) if current_in_canvas else rel_x
         display_y = max(min(rel_y, self.display_height-1), 0) if current_in_canvas else rel_y
         
         if self.current_tool == "pencil":
+            # Ignore jitter - points barely away from the last one add nothing visible
+            if (self.last_x is not None and prev_in_canvas == current_in_canvas and
+                    (canvas_x - self.last_x)**2 + (canvas_y - self.last_y)**2 < self.min_point_dist_sq):
+                return
+            
             # Calculate if mouse moved quickly and potentially skipped boundary
-            if hasattr(self, 'last_x') and hasattr(self, 'last_y'):
+            if self.last_x is not None:
                 # Calculate the distance moved since last point
                 dist = ((prev_event_x - rel_x)**2 + (prev_event_y - rel_y)**2)**0.5
                 
@@ -663,26 +1094,17 @@ class OptiflowApp:
                     # Check if movement is significant enough to calculate intersections
                     if dist > 1.0:  # Lower threshold to catch more crossings
                         # Add boundary intersection point(s)
-                        edge_points = self.calculate_boundary_intersection(
+                        edge_points = self.clip_segment(
                             prev_event_x, prev_event_y, 
                             rel_x, rel_y
                         )
                         for edge_x, edge_y in edge_points:
                             # Convert edge point to canvas coordinates
-                            edge_canvas_x = edge_x / (self.scale_factor * self.zoom_factor)
-                            edge_canvas_y = edge_y / (self.scale_factor * self.zoom_factor)
-                            
-                            # For visual display - draw line to the edge point
-                            if (0 <= edge_x <= self.display_width and 0 <= edge_y <= self.display_height):
-                                self.canvas.create_line(
-                                    max(0, min(self.last_x * self.scale_factor * self.zoom_factor, self.display_width)), 
-                                    max(0, min(self.last_y * self.scale_factor * self.zoom_factor, self.display_height)),
-                                    edge_x, edge_y,
-                                    width=max(1, int(2 * self.scale_factor * self.zoom_factor)), fill=self.pencil_color, smooth=True
-                                )
+                            edge_canvas_x = edge_x * inv_scale
+                            edge_canvas_y = edge_y * inv_scale
                             
                             # Add edge point to stroke data
-                            self.current_stroke.append((edge_canvas_x, edge_canvas_y))
+                            self.add_stroke_point(edge_canvas_x, edge_canvas_y)
                             self.last_x, self.last_y = edge_canvas_x, edge_canvas_y
                 
                 # For fast movements, interpolate points to ensure consistent line quality
@@ -690,52 +1112,28 @@ class OptiflowApp:
                     max_spacing = 10.0  # Maximum allowed spacing between points at display scale
                     
                     # Calculate current spacing in display coordinates, accounting for zoom
-                    spacing = ((self.last_x * self.scale_factor * self.zoom_factor - display_x)**2 + 
-                              (self.last_y * self.scale_factor * self.zoom_factor - display_y)**2)**0.5
+                    display_scale = self.display_scale
+                    spacing = ((self.last_x * display_scale - display_x)**2 + 
+                              (self.last_y * display_scale - display_y)**2)**0.5
                     
                     # If points are too far apart, interpolate between them
                     if spacing > max_spacing:
                         # Calculate number of points to insert
                         num_points = int(spacing / max_spacing)
-                        for i in range(1, num_points):
-                            # Linear interpolation
-                            t = i / num_points
-                            interp_x = self.last_x + (canvas_x - self.last_x) * t
-                            interp_y = self.last_y + (canvas_y - self.last_y) * t
-                            
-                            # Add interpolated point to stroke
-                            self.current_stroke.append((interp_x, interp_y))
-                            
-                            # Draw line segment for visual feedback
-                            if i > 1:  # Skip drawing the first segment as it's handled by the main drawing
-                                prev_x = self.last_x + (canvas_x - self.last_x) * (i-1) / num_points
-                                prev_y = self.last_y + (canvas_y - self.last_y) * (i-1) / num_points
-                                self.canvas.create_line(
-                                    prev_x * self.scale_factor * self.zoom_factor, 
-                                    prev_y * self.scale_factor * self.zoom_factor,
-                                    interp_x * self.scale_factor * self.zoom_factor, 
-                                    interp_y * self.scale_factor * self.zoom_factor,
-                                    width=max(1, int(2 * self.scale_factor * self.zoom_factor)), 
-                                    fill=self.pencil_color, 
-                                    smooth=True
-                                )
-                
-                # If in canvas, draw normally
-                if current_in_canvas:
-                    # If we have a previous point in this stroke
-                    if hasattr(self, 'last_x') and hasattr(self, 'last_y'):
-                        # Draw line on canvas - use proper bounded coordinates
-                        self.canvas.create_line(
-                            max(0, min(self.last_x * self.scale_factor * self.zoom_factor, self.display_width)), 
-                            max(0, min(self.last_y * self.scale_factor * self.zoom_factor, self.display_height)), 
-                            display_x, display_y,  # Use display coordinates for visual accuracy
-                            width=max(1, int(2 * self.scale_factor * self.zoom_factor)), 
-                            fill=self.pencil_color, 
-                            smooth=True
-                        )
+                        
+                        # Linear interpolation of all inserted points at once
+                        t = np.arange(1, num_points, dtype=np.float32)[:, None] / num_points
+                        last = np.array([self.last_x, self.last_y], dtype=np.float32)
+                        step = np.array([canvas_x - self.last_x, canvas_y - self.last_y], dtype=np.float32)
+                        
+                        # Add interpolated points to stroke
+                        self.add_stroke_points(last + step * t)
                 
                 # Add point to the stroke data
-                self.current_stroke.append((canvas_x, canvas_y))
+                self.add_stroke_point(canvas_x, canvas_y)
+                
+                # Extend the single canvas item showing this stroke, at most at display rate
+                self.schedule_live_stroke()
             
             # Always update last position, even if outside canvas
             self.last_x, self.last_y = canvas_x, canvas_y
@@ -744,71 +1142,79 @@ class OptiflowApp:
             # Only erase if we're inside the canvas
             self.erase_at_point(canvas_x, canvas_y)
     
-    def calculate_boundary_intersection(self, x1, y1, x2, y2):
-        """Calculate where a line intersects the canvas boundary"""
-        intersections = []
-        left, top = 0, 0
-        right, bottom = self.display_width, self.display_height
-        
-        # Line equation coefficients: ax + by + c = 0
-        a = y2 - y1
-        b = x1 - x2
-        c = x2*y1 - x1*y2
-        
-        # Exit early if line is too short (avoid divide by zero)
-        if abs(a) < 0.0001 and abs(b) < 0.0001:
-            return []
-        
-        # Add validity checks for intersection points
-        def is_valid_intersection(x, y):
-            # Check if point is actually on the line segment
-            on_segment = (min(x1, x2) <= x <= max(x1, x2)) and (min(y1, y2) <= y <= max(y1, y2))
-            # Check if point is on the canvas boundary (with small tolerance)
-            on_boundary = (abs(x - left) < 0.1 or abs(x - right) < 0.1 or 
-                          abs(y - top) < 0.1 or abs(y - bottom) < 0.1)
-            return on_segment and on_boundary
-        
-        # Check intersection with left boundary (x = left)
-        if abs(b) > 0.0001:  # Avoid division by zero
-            y_left = (-c - a*left) / b
-            if top <= y_left <= bottom and is_valid_intersection(left, y_left):
-                intersections.append((left, y_left))
-        
-        # Check intersection with right boundary (x = right)
-        if abs(b) > 0.0001:  # Avoid division by zero
-            y_right = (-c - a*right) / b
-            if top <= y_right <= bottom and is_valid_intersection(right, y_right):
-                intersections.append((right, y_right))
-        
-        # Check intersection with top boundary (y = top)
-        if abs(a) > 0.0001:  # Avoid division by zero
-            x_top = (-c - b*top) / a
-            if left <= x_top <= right and is_valid_intersection(x_top, top):
-                intersections.append((x_top, top))
-        
-        # Check intersection with bottom boundary (y = bottom)
-        if abs(a) > 0.0001:  # Avoid division by zero
-            x_bottom = (-c - b*bottom) / a
-            if left <= x_bottom <= right and is_valid_intersection(x_bottom, bottom):
-                intersections.append((x_bottom, bottom))
-        
-        # If we have multiple intersections, sort by distance from starting point
-        if len(intersections) > 1:
-            # Use the direction of movement to prioritize
-            dx = x2 - x1
-            dy = y2 - y1
-            
-            # Sort based on dot product with movement vector to find point in the movement direction
-            intersections.sort(key=lambda p: dx * (p[0] - x1) + dy * (p[1] - y1))
-            
-            # If entering canvas, keep furthest entry point (last intersection)
-            # If leaving canvas, keep first exit point (first intersection)
-            if not (0 <= x2 < right and 0 <= y2 < bottom):  # Leaving canvas
-                intersections = [intersections[0]]
-            else:  # Entering canvas
-                intersections = [intersections[-1]]
-        
-        return intersections
+    def add_stroke_point(self, x, y):
+        """Append a point to the stroke being drawn, doubling the buffer when full"""
+        n = self.current_stroke_len
+        if n == len(self.current_stroke):
+            grown = np.empty((2 * n, 2), dtype=np.float32)
+            grown[:n] = self.current_stroke
+            self.current_stroke = grown
+        self.current_stroke[n] = (x, y)
+        self.current_stroke_len = n + 1
+    
+    def add_stroke_points(self, points):
+        """Append an (K, 2) array of points to the stroke being drawn"""
+        n = self.current_stroke_len
+        end = n + len(points)
+        if end > len(self.current_stroke):
+            grown = np.empty((max(2 * len(self.current_stroke), end), 2), dtype=np.float32)
+            grown[:n] = self.current_stroke[:n]
+            self.current_stroke = grown
+        self.current_stroke[n:end] = points
+        self.current_stroke_len = end
+    
+    def update_live_stroke(self):
+        """Show the stroke being drawn as one canvas line item, updating its coordinates"""
+        if self.current_stroke_len == 0:
+            return
+        
+        display_scale = self.display_scale
+        coords = (self.current_stroke[:self.current_stroke_len] * display_scale).ravel().tolist()
+        if self.current_stroke_len == 1:
+            coords = coords * 2  # A zero-length line with round caps shows as a dot
+        if self.live_stroke_item is None:
+            self.live_stroke_item = self.canvas.create_line(
+                *coords,
+                width=max(1, int(2 * display_scale)),
+                fill=self.pencil_color,
+                smooth=True,
+                capstyle=tk.ROUND,
+                joinstyle=tk.ROUND,
+                tags=("stroke",)
+            )
+        else:
+            self.canvas.coords(self.live_stroke_item, *coords)
+    
+    def schedule_live_stroke(self):
+        """Update the live stroke item now, or once the current update interval has passed"""
+        if self.live_after_id is not None:
+            return  # The pending update will include the new points
+        
+        wait = self.last_live_update + self.live_update_interval - time.monotonic()
+        if wait <= 0:
+            self.flush_live_stroke()
+        else:
+            self.live_after_id = self.root.after(max(1, int(wait * 1000)), self.flush_live_stroke)
+    
+    def flush_live_stroke(self):
+        """Redraw the live stroke item with every point added so far"""
+        self.live_after_id = None
+        self.last_live_update = time.monotonic()
+        if self.is_drawing:
+            self.update_live_stroke()
+    
+    def make_stroke(self, points, color=None, width=2):
+        """Create a stroke dict holding its points as an (N, 2) float32 array"""
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        pts.flags.writeable = False  # Finished strokes are shared, never modified in place
+        xmin, ymin = pts.min(axis=0).tolist()
+        xmax, ymax = pts.max(axis=0).tolist()
+        return {
+            "pts": pts,
+            "color": color or self.pencil_color,
+            "width": width,  # Line width in canvas pixels
+            "bbox": (xmin, ymin, xmax, ymax),  # Bounds for quick hit rejection
+        }
     
     def end_stroke(self, event):
         """Handle the end of a stroke, saving it to the current frame only"""
@@ -816,34 +1222,44 @@ class OptiflowApp:
             self.is_drawing = False
             
             if self.current_tool == "pencil":
+                # The final update below replaces any throttled one still pending
+                if self.live_after_id is not None:
+                    self.root.after_cancel(self.live_after_id)
+                    self.live_after_id = None
+                
+                # A single click becomes a zero-length stroke, matching the dot already shown
+                if self.current_stroke_len == 1:
+                    self.add_stroke_point(*self.current_stroke[0])
+                
                 # Only add if it's a valid stroke with at least two points
-                if len(self.current_stroke) > 1:
-                    # Add the stroke to the current strokes list
-                    self.strokes.append(self.current_stroke)
+                if self.current_stroke_len > 1:
+                    # Simplify the finished stroke; boolean indexing also gives it its own compact copy
+                    pts = self.current_stroke[:self.current_stroke_len]
+                    stroke = self.make_stroke(pts[_simplify_mask(pts, self.simplify_tolerance, self.simplify_max_segment)])
+                    self.strokes.append(stroke)
+                    
+                    # The live line item stays on the canvas as this stroke's item
+                    self.update_live_stroke()  # Include points held back by the throttle
+                    self.stroke_items.append(self.live_stroke_item)
+                    
                     # Save the current strokes to the current keyframe
                     # This ensures strokes are saved to the current frame only
-                    self.keyframes[self.current_keyframe] = copy.deepcopy(self.strokes)
+                    self.keyframes[self.current_keyframe] = _clone_strokes(self.strokes)
                     
                     # Log the operation for debugging
                     logger.info(f"Added stroke to keyframe {self.current_keyframe}, now has {len(self.strokes)} strokes")
                     
-                    # Save state for undo after adding the stroke
-                    self.save_state()
-                self.erase_state_saved = False
-            elif self.current_tool == "eraser" and hasattr(self, 'erase_state_saved') and self.erase_state_saved:
-                # Reset the flag so next eraser operation will save state
-                self.erase_state_saved = False
+                    # Record the added stroke for undo
+                    self.push_op({"op": "add", "strokes": [stroke]})
+            
+            # The next eraser drag starts a new undo step
+            self.erase_op = None
             
             # Clean up temporary variables
-            self.current_stroke = []
-            if hasattr(self, 'last_x'):
-                del self.last_x
-            if hasattr(self, 'last_y'):
-                del self.last_y
-            if hasattr(self, 'last_event_x'):
-                del self.last_event_x
-            if hasattr(self, 'last_event_y'):
-                del self.last_event_y
+            self.current_stroke_len = 0
+            self.live_stroke_item = None
+            self.last_x = self.last_y = None
+            self.last_event_x = self.last_event_y = None
     
     def set_keyframe(self):
         """Set current frame as keyframe, including background image"""
@@ -854,8 +1270,8 @@ class OptiflowApp:
             
             # If changing to a different frame, make sure we store current strokes
             if prev_frame != frame_num:
-                # Save previous frame explicitly
-                self.keyframes[prev_frame] = copy.deepcopy(self.strokes)
+                # Save previous frame explicitly - a new list sharing the read-only strokes
+                self.keyframes[prev_frame] = _clone_strokes(self.strokes)
             
             # Call dedicated helper function to save with background for the new frame
             self.save_keyframe_with_background()
@@ -875,7 +1291,7 @@ class OptiflowApp:
         # Save current frame data explicitly before switching
         if current_frame != frame_num and self.strokes:
             # Only save if there are strokes to save and we're actually changing frames
-            self.keyframes[current_frame] = copy.deepcopy(self.strokes)
+            self.keyframes[current_frame] = _clone_strokes(self.strokes)
             logger.info(f"Saved current frame {current_frame} with {len(self.strokes)} strokes before switching")
         
         # Clear the canvas
@@ -883,8 +1299,8 @@ class OptiflowApp:
         
         # Load the strokes for the new frame
         if frame_num in self.keyframes:
-            # Load strokes - make a deep copy to avoid reference issues
-            self.strokes = copy.deepcopy(self.keyframes[frame_num])
+            # Load strokes - copy the list so edits do not change the stored keyframe
+            self.strokes = _clone_strokes(self.keyframes[frame_num])
             logger.info(f"Loaded {len(self.strokes)} strokes for frame {frame_num}")
         else:
             # If the frame doesn't exist yet, initialize with empty strokes
@@ -902,8 +1318,7 @@ class OptiflowApp:
         self.current_keyframe = frame_num
         
         # Reset undo/redo history when changing frames
-        self.history = [copy.deepcopy(self.strokes)]
-        self.redo_stack = []
+        self.reset_history()
         
         # Log active keyframes for debugging
         logger.info(f"Active keyframes: {list(self.keyframes.keys())}")
@@ -919,10 +1334,11 @@ class OptiflowApp:
             self.keyframe_var.set(str(self.current_keyframe))
             self.load_keyframe(self.current_keyframe)
     
-    def clear_canvas(self, save_history=False):
+    def clear_canvas(self):
         """Clear the canvas, removing all drawings"""
-        if save_history and self.strokes:  # Don't save if already empty
-            self.save_state()  # Save current state before clearing
+        if self.strokes:  # Don't record if already empty
+            # Record every removed stroke so the clear can be undone
+            self.push_op({"op": "erase", "indices": list(enumerate(self.strokes))})
         
         # Clear the canvas
         self.canvas.delete("all")
@@ -933,13 +1349,11 @@ class OptiflowApp:
         if cleared_frame in self.keyframes:
             logger.info(f"Removing keyframe {cleared_frame} from keyframes dictionary")
             del self.keyframes[cleared_frame]
+            self.onion_cache.pop(cleared_frame, None)
         
         # Redraw the current canvas
         self.redraw_canvas()
         
-        if save_history:
-            self.save_state()  # Save the cleared state
-        
         # Update status to indicate the frame was cleared
         self.status_var.set(f"Cleared keyframe {cleared_frame}")
 
@@ -958,82 +1372,147 @@ class OptiflowApp:
     def redraw_canvas(self):
         """Redraw the canvas with current strokes and optional onion skins"""
         self.canvas.delete("all")
-        
-        # Set the erase_state_saved flag to False so the next erase operation will save state
-        if hasattr(self, 'erase_state_saved'):
-            self.erase_state_saved = False
+        self.live_stroke_item = None  # Recreated by the next motion event if still drawing
+        self.animation_items = []  # Any animation frame has to be drawn again from scratch
+        self.animation_image_item = None
+        self.animation_shown = None
         
         # Draw onion skins if enabled
         if self.show_onion_skin:
-            # Get strictly previous and next frame numbers, not keyframes
-            current_frame = self.current_keyframe
-            prev_frame = current_frame - 1
-            next_frame = current_frame + 1
-            
-            # Log the frames we're looking for
-            logger.debug(f"Looking for onion skins: prev={prev_frame}, current={current_frame}, next={next_frame}")
-            
-            # Check if these exact frames exist in keyframes dictionary
-            if prev_frame in self.keyframes:
-                logger.debug(f"Drawing previous frame {prev_frame} with blue onion skin")
-                self.draw_onion_skin(self.keyframes[prev_frame], alpha_factor=1.0, color="blue")
-            else:
-                logger.debug(f"Previous frame {prev_frame} not found in keyframes")
-                
-            if next_frame in self.keyframes:
-                logger.debug(f"Drawing next frame {next_frame} with red onion skin")
-                self.draw_onion_skin(self.keyframes[next_frame], alpha_factor=1.0, color="red")
-            else:
-                logger.debug(f"Next frame {next_frame} not found in keyframes")
-        
-        # Draw current strokes on top with dark grey color, adjusted for zoom
-        for stroke in self.strokes:
-            for i in range(len(stroke) - 1):
-                # Convert actual coordinates to display coordinates including zoom factor
-                self.canvas.create_line(
-                    stroke[i][0] * self.scale_factor * self.zoom_factor, 
-                    stroke[i][1] * self.scale_factor * self.zoom_factor, 
-                    stroke[i+1][0] * self.scale_factor * self.zoom_factor, 
-                    stroke[i+1][1] * self.scale_factor * self.zoom_factor, 
-                    width=max(1, int(2 * self.scale_factor * self.zoom_factor)), 
-                    fill=self.pencil_color, 
-                    smooth=True
-                )
-    
-    def draw_onion_skin(self, strokes, alpha_factor=1.0, color="blue"):
-        """Draw an onion skin with the given opacity and color"""
+            self.draw_onion_skins()
+        
+        # Draw current strokes on top, adjusted for zoom
+        self.cache_display_coords(self.strokes)
+        self.stroke_items = [self.create_stroke_item(stroke) for stroke in self.strokes]
+    
+    def create_stroke_item(self, stroke):
+        """Draw a finished stroke as one smoothed canvas line and return its item id"""
+        return self.canvas.create_line(
+            *self.display_coords(stroke),
+            width=max(1, int(stroke["width"] * self.display_scale)), 
+            fill=stroke["color"], 
+            smooth=True,
+            capstyle=tk.ROUND,
+            joinstyle=tk.ROUND,
+            tags=("stroke",)
+        )
+    
+    def draw_onion_skins(self):
+        """Draw the onion skins of the frames either side of the current one"""
+        # Get strictly previous and next frame numbers, not keyframes
+        current_frame = self.current_keyframe
+        prev_frame = current_frame - 1
+        next_frame = current_frame + 1
+        
+        # Log the frames we're looking for
+        logger.debug(f"Looking for onion skins: prev={prev_frame}, current={current_frame}, next={next_frame}")
+        
+        # Check if these exact frames exist in keyframes dictionary
+        if prev_frame in self.keyframes:
+            logger.debug(f"Drawing previous frame {prev_frame} with blue onion skin")
+            self.draw_onion_skin(prev_frame, alpha_factor=1.0, color="blue")
+        else:
+            logger.debug(f"Previous frame {prev_frame} not found in keyframes")
+        
+        if next_frame in self.keyframes:
+            logger.debug(f"Drawing next frame {next_frame} with red onion skin")
+            self.draw_onion_skin(next_frame, alpha_factor=1.0, color="red")
+        else:
+            logger.debug(f"Next frame {next_frame} not found in keyframes")
+    
+    def display_coords(self, stroke):
+        """Flat display-space coordinate list for a stroke, cached until the zoom level changes"""
+        cache = stroke.get("_disp_cache")
+        if cache is None or cache[0] != self.current_zoom_index:
+            # Convert the whole stroke to display coordinates in one operation
+            disp = np.rint(stroke["pts"] * self.display_scale).astype(np.int32)
+            cache = (self.current_zoom_index, disp.ravel().tolist())
+            stroke["_disp_cache"] = cache
+        return cache[1]
+    
+    def cache_display_coords(self, strokes):
+        """Fill the display coordinate cache of many strokes with one transform over their packed points"""
+        zoom_index = self.current_zoom_index
+        stale = [stroke for stroke in strokes
+                 if stroke.get("_disp_cache") is None or stroke["_disp_cache"][0] != zoom_index]
+        if len(stale) < 2:
+            return  # Nothing to batch - display_coords handles single strokes
+        
+        # Pack the stale strokes into one (M, 2) buffer, with offsets into its flattened form
+        offsets = (np.cumsum([0] + [len(stroke["pts"]) for stroke in stale]) * 2).tolist()
+        packed = np.concatenate([stroke["pts"] for stroke in stale])
+        flat = np.rint(packed * self.display_scale).astype(np.int32).ravel().tolist()
+        for stroke, start, end in zip(stale, offsets, offsets[1:]):
+            stroke["_disp_cache"] = (zoom_index, flat[start:end])
+    
+    def draw_onion_skin(self, frame_num, alpha_factor=1.0, color="blue"):
+        """Draw a keyframe's onion skin with the given opacity and color as one cached image"""
+        strokes = self.keyframes[frame_num]
+        
         # Calculate opacity in hex format (00-FF)
         alpha = int((self.onion_skin_opacity / 100.0) * alpha_factor * 255)
-        alpha_hex = format(alpha, '02x')
         
-        # Create color with alpha transparency
-        hex_color = f"#{color}{alpha_hex}" if color in ["red", "blue"] else f"#{color}{alpha_hex}"
+        # Reuse the stroke mask rendered for this keyframe if the strokes and zoom are unchanged.
+        # The cache entry holds the strokes themselves, so their ids cannot be reused while cached.
+        key = (tuple(id(stroke) for stroke in strokes), self.current_zoom_index)
+        cached = self.onion_cache.get(frame_num)
+        if cached is None or cached["key"] != key:
+            logger.debug(f"Rendering onion skin layer for frame {frame_num}")
+            cached = {"key": key, "strokes": tuple(strokes), "mask": self.render_onion_mask(strokes), "look": None, "photo": None}
+            self.onion_cache[frame_num] = cached
+        self.onion_cache.move_to_end(frame_num)
+        
+        # Each layer holds a display-size mask and image, so only the most recently shown are kept
+        while len(self.onion_cache) > self.max_onion_cache:
+            self.onion_cache.popitem(last=False)
+        
+        # Opacity and color are applied on top of the mask, so changing them never replays strokes
+        look = (alpha, color)
+        if cached["look"] != look:
+            cached["photo"] = self.tint_onion_mask(cached["mask"], alpha, color)
+            cached["look"] = look
+        
+        self.canvas.create_image(0, 0, anchor=tk.NW, image=cached["photo"], tags=("onion",))
+    
+    def render_onion_mask(self, strokes):
+        """Rasterise strokes into an 8-bit coverage mask at display size"""
+        from PIL import ImageDraw  # Only needed once onion skins are shown
+        display_scale = self.display_scale
         
-        # Draw strokes with transparency, accounting for zoom
+        mask = Image.new("L", (self.display_width, self.display_height), 0)
+        draw = ImageDraw.Draw(mask)
+        
+        # Draw each stroke into the mask as one polyline, accounting for zoom
+        self.cache_display_coords(strokes)
         for stroke in strokes:
-            for i in range(len(stroke) - 1):
-                # Convert actual coordinates to display coordinates with zoom
-                x1 = stroke[i][0] * self.scale_factor * self.zoom_factor
-                y1 = stroke[i][1] * self.scale_factor * self.zoom_factor
-                x2 = stroke[i+1][0] * self.scale_factor * self.zoom_factor
-                y2 = stroke[i+1][1] * self.scale_factor * self.zoom_factor
-                
-                # In tkinter, you can't set alpha directly, so we use lighter colors
-                # to simulate transparency
-                if color == "blue":
-                    line_color = f"#{alpha_hex}{alpha_hex}ff"  # Blue with alpha
-                elif color == "red":
-                    line_color = f"#ff{alpha_hex}{alpha_hex}"  # Red with alpha
-                else:
-                    line_color = f"#{alpha_hex}{alpha_hex}{alpha_hex}"  # Gray with alpha
-                
-                self.canvas.create_line(
-                    x1, y1, x2, y2,
-                    width=max(1, int(1.5 * self.scale_factor * self.zoom_factor)), 
-                    fill=line_color, 
-                    smooth=True,
-                    dash=(3, 2)  # Dashed line for onion skin
-                )
+            # Display coordinates are shared with the canvas lines, converted once per zoom level
+            draw.line(
+                self.display_coords(stroke),
+                fill=255,
+                width=max(1, int(1.5 * display_scale)),
+                joint="curve"
+            )
+        
+        return mask
+    
+    def tint_onion_mask(self, mask, alpha, color="blue"):
+        """Colour an onion skin mask into a transparent PhotoImage"""
+        from PIL import ImageTk  # Only needed once onion skins are shown
+        alpha_hex = format(alpha, '02x')
+        
+        # Use lighter colors to simulate transparency
+        if color == "blue":
+            line_color = f"#{alpha_hex}{alpha_hex}ff"  # Blue with alpha
+        elif color == "red":
+            line_color = f"#ff{alpha_hex}{alpha_hex}"  # Red with alpha
+        else:
+            line_color = f"#{alpha_hex}{alpha_hex}{alpha_hex}"  # Gray with alpha
+        
+        # One solid fill plus the mask as alpha channel - both single passes in Pillow's C core
+        layer = Image.new("RGBA", mask.size, line_color)
+        layer.putalpha(mask)
+        
+        return ImageTk.PhotoImage(layer)
     
     def toggle_onion_skin(self):
         """Enable or disable onion skinning"""
@@ -1041,15 +1520,22 @@ class OptiflowApp:
         self.redraw_canvas()
     
     def update_onion_skin(self, _=None):
-        """Update onion skinning settings and redraw"""
-        self.onion_skin_opacity = self.opacity_var.get()
+        """Update onion skinning settings and schedule a redraw"""
+        # The slider fires for every pixel dragged, so coalesce into one redraw per pause
+        if self.onion_after_id is not None:
+            self.root.after_cancel(self.onion_after_id)
+        self.onion_after_id = self.root.after(self.slider_redraw_delay, self.apply_onion_opacity)
+    
+    def apply_onion_opacity(self):
+        """Redraw with the current opacity slider value"""
+        self.onion_after_id = None
+        opacity = self.opacity_var.get()
+        if opacity == self.onion_skin_opacity:
+            return  # Slider moved within the same integer step
+        self.onion_skin_opacity = opacity
         self.redraw_canvas()
     
     def interpolate_frames(self):
-        # Save the current state before interpolation
-        if self.strokes:
-            self.save_state()
-        
         try:
             start_frame = int(self.start_frame_var.get())
             end_frame = int(self.end_frame_var.get())
@@ -1059,6 +1545,10 @@ class OptiflowApp:
                 messagebox.showerror("Error", "Start or end keyframe not found")
                 return
             
+            if self.interpolation_future is not None:
+                self.status_var.set("An interpolation is already running")
+                return
+            
             start_strokes = self.keyframes[start_frame]
             end_strokes = self.keyframes[end_frame]
             
@@ -1071,162 +1561,218 @@ class OptiflowApp:
             
             logger.info("Using optical flow interpolation")
             
-            # Create interpolated frames
-            for i in range(1, num_inbetweens + 1):
-                new_frame_num = start_frame + i * (end_frame - start_frame) / (num_inbetweens + 1)
-                new_frame_num = int(new_frame_num)
+            # Calculate interpolation factors (0.0 to 1.0)
+            factors = [i / (num_inbetweens + 1) for i in range(1, num_inbetweens + 1)]
+            
+            # Create interpolated strokes using optical flow, sharing one flow field, on a background
+            # thread so the window stays responsive. The stroke lists are copied, the strokes are read-only.
+            import concurrent.futures
+            if self.interpolation_executor is None:
+                self.interpolation_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            future = self.interpolation_executor.submit(
+                self._interpolate_strokes, list(start_strokes), list(end_strokes), factors)
+            self.interpolation_future = future
+            
+            progress = ttk.Progressbar(self.root, mode='indeterminate')
+            progress.pack(fill='x', padx=10, pady=5)
+            progress.start()
+            self.status_var.set(f"Interpolating between {start_frame} and {end_frame}...")
+            
+            # Poll for the result from the Tk thread - Tk must not be called from the worker
+            def check_done():
+                # Wait for the result, and don't swap frames under a running animation or a stroke being drawn
+                if not future.done() or self.animation_running or self.is_drawing:
+                    self.root.after(50, check_done)
+                    return
+                self.interpolation_future = None
+                progress.stop()
+                progress.destroy()
+                
+                try:
+                    all_new_strokes = future.result()
+                except ImportError:
+                    logger.error("OpenCV not available - optical flow interpolation requires OpenCV")
+                    messagebox.showerror("Error", "OpenCV not available. Optical flow interpolation requires OpenCV to be installed.")
+                    return
+                except Exception as e:
+                    logger.error(f"Optical flow interpolation failed: {str(e)}", exc_info=True)
+                    messagebox.showerror("Error", f"Optical flow interpolation failed: {str(e)}")
+                    return
+                
+                # Create interpolated frames
+                new_frame_nums = set()
+                for i, new_strokes in enumerate(all_new_strokes, 1):
+                    new_frame_num = start_frame + i * (end_frame - start_frame) / (num_inbetweens + 1)
+                    new_frame_num = int(new_frame_num)
+                    
+                    # Store the interpolated frame
+                    self.keyframes[new_frame_num] = new_strokes
+                    new_frame_nums.add(new_frame_num)
                 
-                # Calculate interpolation factor (0.0 to 1.0)
-                factor = i / (num_inbetweens + 1)
+                # The current frame is edited through its own stroke list, so reload it as a frame switch would
+                current_frame = self.current_keyframe
+                if current_frame in new_frame_nums:
+                    self.strokes = _clone_strokes(self.keyframes[current_frame])
+                    self.reset_history()  # Undo steps refer to the replaced strokes
                 
-                # Create interpolated strokes using optical flow
-                new_strokes = self.optical_flow_interpolate(start_strokes, end_strokes, factor)
+                # Show the new inbetweens right away if they are on screen, directly or as onion skins
+                if new_frame_nums & {current_frame - 1, current_frame, current_frame + 1}:
+                    self.redraw_canvas()
                 
-                # Store the interpolated frame
-                self.keyframes[new_frame_num] = new_strokes
+                self.status_var.set(f"Created {num_inbetweens} interpolated frames between {start_frame} and {end_frame} using Optical Flow")
             
-            self.status_var.set(f"Created {num_inbetweens} interpolated frames between {start_frame} and {end_frame} using Optical Flow")
+            self.root.after(50, check_done)
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid input values: {str(e)}")
     
-    def optical_flow_interpolate(self, start_strokes, end_strokes, factor):
-        """
-        Optical flow interpolation between two frames
-        Uses GPU acceleration when available with cross-platform support
-        """
-        logger.info(f"Performing OPTICAL FLOW interpolation with factor {factor}")
-        
-        progress = ttk.Progressbar(self.root, mode='indeterminate')
-        progress.pack(fill='x', padx=10, pady=5)
-        progress.start()
-        self.root.update()
+    def _interpolate_strokes(self, start_strokes, end_strokes, factors):
+        """Interpolated strokes for every factor - makes no Tk calls, so it can run on a worker thread"""
+        logger.info(f"Performing OPTICAL FLOW interpolation with factors {factors}")
+        import cv2
+        
+        # The flow field only depends on the two frames, not on the factor, so it is reused
+        # when the same pair is interpolated again. The cache entry holds the strokes
+        # themselves, so their ids cannot be reused while cached.
+        key = (tuple(id(stroke) for stroke in start_strokes), tuple(id(stroke) for stroke in end_strokes))
+        cached = self.flow_cache.get(key)
+        if cached is None:
+            start_img, flow = self._compute_flow(start_strokes, end_strokes, cv2)
+            cached = {"strokes": (tuple(start_strokes), tuple(end_strokes)), "start_img": start_img, "flow": flow}
+            self.flow_cache[key] = cached
+            while len(self.flow_cache) > self.max_flow_cache:
+                self.flow_cache.popitem(last=False)
+        else:
+            logger.info("Reusing the optical flow computed for this frame pair")
+            self.flow_cache.move_to_end(key)
+        start_img, flow = cached["start_img"], cached["flow"]
+        
+        # Warp the start frame part of the way along the flow for every factor. This stays
+        # sequential: remap is already multithreaded inside OpenCV and shares the map buffers
+        frames = [self._warp_by_flow(start_img, flow, factor, cv2) for factor in factors]
+        
+        # Extract strokes from the interpolated images - each inbetween is independent and
+        # OpenCV and the snap kernel release the GIL
+        import concurrent.futures
+        def extract(frame, factor):
+            return self._extract_strokes_from_image(frame, start_strokes, end_strokes, factor, cv2)
+        workers = max(1, min(len(factors), os.cpu_count() or 1))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(extract, frames, factors))
+    
+    def _compute_flow(self, start_strokes, end_strokes, cv2):
+        """Rasterise both frames and compute the dense optical flow from start to end"""
+        # Check if accelerated computing is available (OpenCL or Metal for Mac)
+        has_opencl = False
+        has_metal = False
         
+        # Check for OpenCL support (works on Windows, Linux, and Mac)
         try:
-            import cv2
-            import numpy as np
-            
-            # Check if accelerated computing is available (OpenCL or Metal for Mac)
-            has_opencl = False
-            has_metal = False
-            
-            # Check for OpenCL support (works on Windows, Linux, and Mac)
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                has_opencl = cv2.ocl.useOpenCL()
+                logger.info(f"OpenCL acceleration: {'Available' if has_opencl else 'Not available'}")
+        except Exception:
+            logger.info("OpenCL support check failed")
+        
+        # On macOS, check for Metal support
+        if not has_opencl and self.windowing_system == 'aqua':
             try:
-                if cv2.ocl.haveOpenCL():
-                    cv2.ocl.setUseOpenCL(True)
-                    has_opencl = cv2.ocl.useOpenCL()
-                    logger.info(f"OpenCL acceleration: {'Available' if has_opencl else 'Not available'}")
+                # Indirect check for Metal through VideoCapture backend
+                # This isn't a perfect check but helps differentiate Metal capability
+                metal_check = cv2.videoio_registry.getBackendName(cv2.CAP_AVFOUNDATION) == "AVFoundation"
+                has_metal = metal_check and int(cv2.__version__.split('.')[0]) >= 4
+                logger.info(f"Metal acceleration: {'Available' if has_metal else 'Not available'}")
             except Exception:
-                logger.info("OpenCL support check failed")
-                
-            # On macOS, check for Metal support
-            if not has_opencl and self.root.tk.call('tk', 'windowingsystem') == 'aqua':
-                try:
-                    # Indirect check for Metal through VideoCapture backend
-                    # This isn't a perfect check but helps differentiate Metal capability
-                    metal_check = cv2.videoio_registry.getBackendName(cv2.CAP_AVFOUNDATION) == "AVFoundation"
-                    has_metal = metal_check and int(cv2.__version__.split('.')[0]) >= 4
-                    logger.info(f"Metal acceleration: {'Available' if has_metal else 'Not available'}")
-                except Exception:
-                    logger.info("Metal support check failed")
-            
-            # Create blank canvases at a resolution that balances detail and performance
-            canvas_width, canvas_height = 1920, 1080  # Fixed size for consistent performance
-            
-            # Create images from strokes
-            start_img = np.ones((canvas_height, canvas_width), dtype=np.uint8) * 255
-            end_img = np.ones((canvas_height, canvas_width), dtype=np.uint8) * 255
-            
-            # Draw strokes on canvases - pass cv2 to the helper methods
-            self._draw_strokes_on_numpy_array(start_img, start_strokes, cv2)
-            self._draw_strokes_on_numpy_array(end_img, end_strokes, cv2)
-            
-            # Calculate optical flow using best available method
-            if has_opencl or has_metal:
-                # Use OpenCV's optimized optical flow with GPU acceleration
-                # This uses OpenCL on Windows/Linux and Metal optimizations on Mac
-                flow = cv2.calcOpticalFlowFarneback(
-                    start_img, end_img, None, 
-                    pyr_scale=0.5, levels=5, winsize=13, 
-                    iterations=10, poly_n=5, poly_sigma=1.2, flags=0
-                )
-                logger.info("Using GPU-accelerated optical flow")
-            else:
-                # CPU fallback with optimized parameters
-                flow = cv2.calcOpticalFlowFarneback(
-                    start_img, end_img, None, 
-                    pyr_scale=0.5, levels=3, winsize=13, 
-                    iterations=7, poly_n=5, poly_sigma=1.2, flags=0
-                )
-                logger.info("Using CPU optical flow")
-            
-            # Use flow vectors to interpolate between frames
-            h, w = flow.shape[:2]
-            
-            # Create the interpolated frame
-            # Scale the flow by the interpolation factor
-            flow_x = flow[..., 0] * factor
-            flow_y = flow[..., 1] * factor
-            
-            # Create mapping grid for remapping
-            map_x = np.float32(np.tile(np.arange(w), (h, 1)))
-            map_y = np.float32(np.tile(np.arange(h), (w, 1)).T)
-            
-            # Apply flow to generate mapped coordinates
-            interp_map_x = map_x + flow_x
-            interp_map_y = map_y + flow_y
-            
-            # Apply reverse mapping to warp the image
-            interpolated = cv2.remap(start_img, interp_map_x, interp_map_y, 
-                                    cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
-            
-            # Extract strokes from the interpolated image - pass cv2 to the helper method
-            new_strokes = self._extract_strokes_from_image(interpolated, start_strokes, end_strokes, factor, cv2)
-            
-            return new_strokes
-        
-        except ImportError:
-            logger.error("OpenCV not available - optical flow interpolation requires OpenCV")
-            messagebox.showerror("Error", "OpenCV not available. Optical flow interpolation requires OpenCV to be installed.")
-            return []
-        except Exception as e:
-            logger.error(f"Optical flow interpolation failed: {str(e)}", exc_info=True)
-            messagebox.showerror("Error", f"Optical flow interpolation failed: {str(e)}")
-            return []
-        finally:
-            progress.stop()
-            progress.destroy()
+                logger.info("Metal support check failed")
+        
+        # Create blank canvases at a resolution that balances detail and performance
+        canvas_width, canvas_height = 1920, 1080  # Fixed size for consistent performance
+        
+        # Create images from strokes
+        start_img = np.full((canvas_height, canvas_width), 255, dtype=np.uint8)
+        end_img = np.full((canvas_height, canvas_width), 255, dtype=np.uint8)
+        
+        # Draw strokes on canvases - pass cv2 to the helper methods
+        self._draw_strokes_on_numpy_array(start_img, start_strokes, cv2)
+        self._draw_strokes_on_numpy_array(end_img, end_strokes, cv2)
+        
+        # Line drawings lose next to nothing at lower resolution, while Farneback
+        # cost grows with the pixel count
+        scale = self.flow_downscale
+        small_size = (canvas_width // scale, canvas_height // scale)
+        small_start = cv2.resize(start_img, small_size, interpolation=cv2.INTER_AREA)
+        small_end = cv2.resize(end_img, small_size, interpolation=cv2.INTER_AREA)
+        
+        # OpenCV only dispatches to OpenCL kernels for UMat inputs, plain arrays stay on the CPU
+        if has_opencl:
+            small_start, small_end = cv2.UMat(small_start), cv2.UMat(small_end)
+        
+        # Calculate optical flow using best available method
+        if has_opencl or has_metal:
+            # Use OpenCV's optimized optical flow with GPU acceleration
+            # This uses OpenCL on Windows/Linux and Metal optimizations on Mac
+            flow = cv2.calcOpticalFlowFarneback(
+                small_start, small_end, None, 
+                pyr_scale=0.5, levels=5, winsize=13, 
+                iterations=10, poly_n=5, poly_sigma=1.2, flags=0
+            )
+            logger.info("Using GPU-accelerated optical flow")
+        else:
+            # CPU fallback with optimized parameters
+            flow = cv2.calcOpticalFlowFarneback(
+                small_start, small_end, None, 
+                pyr_scale=0.5, levels=3, winsize=13, 
+                iterations=7, poly_n=5, poly_sigma=1.2, flags=0
+            )
+            logger.info("Using CPU optical flow")
+        
+        # Download the result if it was computed on the OpenCL device
+        if isinstance(flow, cv2.UMat):
+            flow = flow.get()
+        
+        # Back to full resolution, with vectors scaled to full-resolution pixels
+        flow = cv2.resize(flow, (canvas_width, canvas_height), interpolation=cv2.INTER_LINEAR)
+        flow *= scale
+        
+        return start_img, np.ascontiguousarray(flow, dtype=np.float32)
+    
+    def _warp_by_flow(self, start_img, flow, factor, cv2):
+        """Warp the start image by the flow scaled by the interpolation factor"""
+        h, w = flow.shape[:2]
+        
+        # Displace the pixel grid by the flow scaled by the interpolation factor in one pass,
+        # into coordinate maps kept between calls for the same image size
+        if self.remap_maps is None or self.remap_maps[0].shape != (h, w):
+            self.remap_maps = (np.empty((h, w), dtype=np.float32), np.empty((h, w), dtype=np.float32))
+        interp_map_x, interp_map_y = self.remap_maps
+        _flow_remap_coords(flow, factor, interp_map_x, interp_map_y)
+        
+        # Fixed-point maps are half the size and take remap's faster integer path
+        map1, map2 = cv2.convertMaps(interp_map_x, interp_map_y, cv2.CV_16SC2)
+        
+        # Apply reverse mapping to warp the image
+        return cv2.remap(start_img, map1, map2, 
+                         cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
 
-    def _find_point_at_param(self, stroke, t):
-        """Helper function to find a point at parametric position t along a stroke"""
-        if t <= 0:
-            return stroke[0]
-        if t >= 1:
-            return stroke[-1]
-        
-        # Calculate total length of the stroke
-        lengths = [0.0]
-        total_length = 0.0
-        for i in range(1, len(stroke)):
-            segment_length = ((stroke[i][0] - stroke[i-1][0])**2 + 
-                             (stroke[i][1] - stroke[i-1][1])**2)**0.5
-            total_length += segment_length
-            lengths.append(total_length)
+    def _arclength_params(self, stroke):
+        """Normalised cumulative arclength (0 to 1) at each point of an (N, 2) stroke"""
+        segment_lengths = np.sqrt((np.diff(stroke.astype(np.float64), axis=0)**2).sum(axis=1))
+        lengths = np.concatenate(([0.0], np.cumsum(segment_lengths)))
         
         # Normalize lengths to [0, 1]
-        if total_length > 0:
-            lengths = [l / total_length for l in lengths]
-        
-        # Find the segment containing t
-        for i in range(1, len(lengths)):
-            if lengths[i-1] <= t < lengths[i]:
-                # Interpolate within this segment
-                segment_t = (t - lengths[i-1]) / (lengths[i] - lengths[i-1]) if lengths[i] > lengths[i-1] else 0
-                x = stroke[i-1][0] + segment_t * (stroke[i][0] - stroke[i-1][0])
-                y = stroke[i-1][1] + segment_t * (stroke[i][1] - stroke[i-1][1])
-                return (x, y)
-        
-        # Fallback
-        return stroke[-1]
+        if lengths[-1] > 0:
+            lengths /= lengths[-1]
+        return lengths
+    
+    def _points_at_params(self, stroke, ts):
+        """Points at parametric positions ts (0 to 1, by arclength) along a stroke, as an (M, 2) array"""
+        lengths = self._arclength_params(stroke)
+        
+        # Piecewise linear lookup of both coordinates for every t at once
+        points = np.empty((len(ts), 2), dtype=np.float64)
+        points[:, 0] = np.interp(ts, lengths, stroke[:, 0])
+        points[:, 1] = np.interp(ts, lengths, stroke[:, 1])
+        return points
 
     def _draw_strokes_on_numpy_array(self, img, strokes, cv2=None):
         """Draw strokes on a numpy array image"""
@@ -1238,21 +1784,16 @@ class OptiflowApp:
             
         h, w = img.shape if len(img.shape) == 2 else img.shape[:2]
         
-        for stroke in strokes:
-            # Skip strokes with fewer than 2 points
-            if len(stroke) < 2:
-                continue
-                
-            points = []
-            for point in stroke:
-                # Scale stroke coordinates to image dimensions
-                x = int(point[0] * w / self.canvas_width)
-                y = int(point[1] * h / self.canvas_height)
-                points.append((x, y))
-                
-            # Draw lines connecting points
-            for i in range(len(points) - 1):
-                cv2.line(img, points[i], points[i+1], 0, thickness=2)
+        # Scale stroke coordinates to image dimensions, skipping strokes with fewer than 2 points
+        image_scale = np.array([w / self.canvas_width, h / self.canvas_height], dtype=np.float32)
+        polylines = [
+            (stroke["pts"] * image_scale).astype(np.int32).reshape(-1, 1, 2)
+            for stroke in strokes if len(stroke["pts"]) >= 2
+        ]
+        
+        # Draw every stroke in one call
+        if polylines:
+            cv2.polylines(img, polylines, isClosed=False, color=0, thickness=2)
 
     def _extract_strokes_from_image(self, img, start_strokes, end_strokes, factor, cv2=None):
         """Extract stroke data from the interpolated image using intelligent path tracing"""
@@ -1262,9 +1803,6 @@ class OptiflowApp:
             import cv2 as cv2_local
             cv2 = cv2_local
         
-        # Also need numpy
-        import numpy as np
-        
         # First try contour detection
         _, binary = cv2.threshold(img, 240, 255, cv2.THRESH_BINARY_INV)
         
@@ -1272,80 +1810,45 @@ class OptiflowApp:
         kernel = np.ones((3,3), np.uint8)
         binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
         
-        # Find contours
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Snapping needs stroke pixels to snap to
+        has_ink = cv2.countNonZero(binary) > 0
         
         new_strokes = []
+        canvas_w, canvas_h = self.canvas_width, self.canvas_height
+        make_stroke = self.make_stroke
         
         # For better quality, use stroke matching instead of just contours
         # This approach matches start and end strokes and uses optical flow to trace their paths
         for j in range(min(len(start_strokes), len(end_strokes))):
-            start_stroke = start_strokes[j]
-            end_stroke = end_strokes[j]
-            
-            if len(start_stroke) == len(end_stroke):
-                # Create an interpolated stroke by following the flow
-                new_stroke = []
-                for k in range(len(start_stroke)):
-                    # Get corresponding points
-                    start_point = start_stroke[k]
-                    end_point = end_stroke[k]
-                    
-                    # Linear interpolation as fallback (more reliable than pure flow for points)
-                    new_x = (1 - factor) * start_point[0] + factor * end_point[0]
-                    new_y = (1 - factor) * start_point[1] + factor * end_point[1]
-                    
-                    # Check if the point falls on a contour in the flow image
-                    # This helps snap points to actual visible lines
-                    h, w = img.shape if len(img.shape) == 2 else img.shape[:2]
-                    img_x = int(new_x * w / self.canvas_width)
-                    img_y = int(new_y * h / self.canvas_height)
-                    
-                    # Check 5x5 region around point to find black pixels (stroke)
-                    radius = 5
-                    img_x = max(radius, min(w-radius-1, img_x))
-                    img_y = max(radius, min(h-radius-1, img_y))
-                    region = binary[img_y-radius:img_y+radius+1, img_x-radius:img_x+radius+1]
-                    
-                    # If we found stroke pixels, adjust the point to the center of mass
-                    if np.any(region > 0):
-                        # Find center of mass of white pixels
-                        white_y, white_x = np.where(region > 0)
-                        if len(white_x) > 0:
-                            center_x = np.mean(white_x) + img_x - radius
-                            center_y = np.mean(white_y) + img_y - radius
-                            
-                            # Convert back to canvas coordinates
-                            adjusted_x = center_x * self.canvas_width / w
-                            adjusted_y = center_y * self.canvas_height / h
-                            
-                            # Blend with original interpolation for stability
-                            new_x = 0.7 * adjusted_x + 0.3 * new_x
-                            new_y = 0.7 * adjusted_y + 0.3 * new_y
-                    
-                    new_stroke.append((new_x, new_y))
-                new_strokes.append(new_stroke)
+            start_stroke = start_strokes[j]["pts"]
+            end_stroke = end_strokes[j]["pts"]
+            
+            if np.array_equal(start_stroke, end_stroke):
+                # A stroke that doesn't move is its own inbetween
+                new_strokes.append(start_strokes[j])
+            elif len(start_stroke) == len(end_stroke):
+                if has_ink:
+                    # Linear interpolation snapped to the visible lines of the flow image
+                    # (more reliable than pure flow for points)
+                    new_stroke = _snap_interp(start_stroke, end_stroke, binary, canvas_w, canvas_h, factor, 5)
+                else:
+                    # Nothing visible to snap to - plain linear interpolation
+                    new_stroke = (1 - factor) * start_stroke.astype(np.float64) + factor * end_stroke.astype(np.float64)
+                
+                new_strokes.append(make_stroke(new_stroke))
             else:
                 # Use the reparameterization approach for different point counts
                 # This produces better quality than the contour method for uneven strokes
-                new_stroke = []
-                
                 # Create an adaptive number of points based on stroke complexity
                 num_points = max(len(start_stroke), len(end_stroke))
                 
-                # Parameterize both strokes
-                for t in np.linspace(0, 1, num_points):
-                    # Find corresponding points on each stroke based on parameterization
-                    start_param = self._find_point_at_param(start_stroke, t)
-                    end_param = self._find_point_at_param(end_stroke, t)
-                    
-                    # Interpolate between them
-                    new_x = (1 - factor) * start_param[0] + factor * end_param[0]
-                    new_y = (1 - factor) * start_param[1] + factor * end_param[1]
-                    
-                    new_stroke.append((new_x, new_y))
-                    
-                new_strokes.append(new_stroke)
+                # Parameterize both strokes and find corresponding points on each
+                ts = np.linspace(0, 1, num_points)
+                start_points = self._points_at_params(start_stroke, ts)
+                end_points = self._points_at_params(end_stroke, ts)
+                
+                # Interpolate between them
+                new_strokes.append(make_stroke((1 - factor) * start_points + factor * end_points))
         
         return new_strokes
 
@@ -1360,16 +1863,19 @@ class OptiflowApp:
             fps = int(self.fps_var.get())
             if fps < 1:  # Prevent division by zero or negative values
                 fps = 12
-            delay = int(1000 / fps)  # Milliseconds between frames
+            period = 1.0 / fps  # Seconds between frames
             
             frame_nums = sorted(self.keyframes.keys())
             if not frame_nums:
                 messagebox.showerror("Error", "No frames to animate")
                 return
             
+            # Prerender frames to images if they all fit the memory budget, otherwise reuse line items
+            self.reset_animation_photos(len(frame_nums))
+            
             # Store the current state to restore after animation
             self.animation_current_frame = self.current_keyframe
-            self.animation_current_strokes = copy.deepcopy(self.strokes)
+            self.animation_current_strokes = self.strokes  # Playback never modifies the list, so keep it as is
             
             self.animation_running = True
             self.play_btn.config(state=tk.DISABLED)  # Disable play button while playing
@@ -1383,37 +1889,34 @@ class OptiflowApp:
             self.canvas.unbind("<B1-Motion>")
             self.canvas.unbind("<ButtonRelease-1>")
             
-            # Define a recursive function to show frames
-            def show_frame(index):
+            # Frames are timed against the start of playback, so slow ticks don't add up to drift
+            start_time = time.monotonic()
+            
+            # Define a recursive function to show frames; tick counts frames since playback started
+            def show_frame(tick):
                 if not self.animation_running:
                     return
                 try:
-                    frame_num = frame_nums[index % len(frame_nums)]
+                    frame_num = frame_nums[tick % len(frame_nums)]
                     strokes = self.keyframes[frame_num]
                     
-                    # Clear canvas and draw strokes
-                    self.canvas.delete("all")
-                    
-                    # Draw strokes with dark grey color, accounting for zoom
-                    for stroke in strokes:
-                        for i in range(len(stroke) - 1):
-                            # Scale for display, including zoom factor
-                            x1 = stroke[i][0] * self.scale_factor * self.zoom_factor
-                            y1 = stroke[i][1] * self.scale_factor * self.zoom_factor
-                            x2 = stroke[i+1][0] * self.scale_factor * self.zoom_factor
-                            y2 = stroke[i+1][1] * self.scale_factor * self.zoom_factor
-                            self.canvas.create_line(
-                                x1, y1, x2, y2,
-                                width=max(1, int(2 * self.scale_factor * self.zoom_factor)),
-                                fill=self.pencil_color, 
-                                smooth=True
-                            )
+                    # Leave the canvas alone if this frame's strokes are already shown
+                    shown = tuple(id(stroke) for stroke in strokes)
+                    if shown != self.animation_shown:
+                        if self.animation_photos is not None:
+                            self.show_animation_photo(frame_num, strokes, shown)
+                        else:
+                            self.show_animation_strokes(strokes)
+                        self.animation_shown = shown
                     
                     # Update status to show current frame
-                    self.status_var.set(f"Animation playing: Frame {frame_num} of {len(frame_nums)}")
+                    self._set_status(f"Animation playing: Frame {frame_num} of {len(frame_nums)}")
                     
-                    # Schedule the next frame
-                    self.root.after(delay, show_frame, (index + 1) % len(frame_nums))
+                    # Schedule the next frame for its due time, skipping any frames that are already overdue
+                    now = time.monotonic()
+                    next_tick = max(tick + 1, int((now - start_time) / period))
+                    delay = max(1, int((start_time + next_tick * period - now) * 1000))
+                    self.root.after(delay, show_frame, next_tick)
                 except Exception as e:
                     logger.error(f"Animation error: {str(e)}", exc_info=True)
                     self.stop_animation()
@@ -1430,12 +1933,92 @@ class OptiflowApp:
             messagebox.showerror("Error", f"Animation failed: {str(e)}")
             self.animation_running = False
     
+    def reset_animation_photos(self, frame_count):
+        """Drop any prerendered animation frames, prerendering from now on only if all frames fit the memory budget"""
+        frame_pixels = self.display_width * self.display_height
+        self.animation_photos = {} if frame_count * frame_pixels <= self.max_animation_pixels else None
+    
+    def show_animation_photo(self, frame_num, strokes, shown):
+        """Show an animation frame as one image, rendered the first time the frame comes round"""
+        # Images are rendered at display size, so they are only valid for the zoom level they were made at
+        key = (shown, self.current_zoom_index)
+        cached = self.animation_photos.get(frame_num)
+        if cached is None or cached[0] != key:
+            from PIL import ImageTk  # Only needed once the animation is played
+            cached = (key, ImageTk.PhotoImage(self.render_animation_frame(strokes)))
+            self.animation_photos[frame_num] = cached
+        
+        if self.animation_image_item is None:
+            # First frame since the canvas was last rebuilt - start from an empty canvas
+            self.canvas.delete("all")
+            self.stroke_items = []  # The current strokes are no longer on the canvas
+            self.animation_items = []
+            self.animation_image_item = self.canvas.create_image(0, 0, anchor=tk.NW, image=cached[1])
+        else:
+            # Every later frame is a single image swap
+            self.canvas.itemconfigure(self.animation_image_item, image=cached[1])
+    
+    def render_animation_frame(self, strokes):
+        """Rasterise an animation frame's strokes onto a white image at display size"""
+        from PIL import ImageDraw  # Only needed once the animation is played
+        line_width = max(1, int(2 * self.display_scale))
+        
+        img = Image.new("RGB", (self.display_width, self.display_height), "white")
+        draw = ImageDraw.Draw(img)
+        
+        # Draw each stroke as one polyline, accounting for zoom
+        self.cache_display_coords(strokes)
+        for stroke in strokes:
+            draw.line(self.display_coords(stroke), fill=stroke["color"], width=line_width, joint="curve")
+        
+        return img
+    
+    def show_animation_strokes(self, strokes):
+        """Show an animation frame's strokes, moving the previous frame's line items rather than recreating them"""
+        if self.animation_shown is None:
+            # First frame since the canvas was last rebuilt - start from an empty canvas
+            self.canvas.delete("all")
+            self.stroke_items = []  # The current strokes are no longer on the canvas
+            self.animation_items = []
+        
+        # Draw each stroke as one polyline item, accounting for zoom
+        line_width = max(1, int(2 * self.display_scale))  # Same for every stroke of the animation
+        items = self.animation_items
+        used = 0
+        self.cache_display_coords(strokes)
+        for stroke in strokes:
+            # Display coordinates are cached on the stroke, so later loops reuse them
+            coords = self.display_coords(stroke)
+            if len(coords) < 4:
+                continue  # A line item needs at least two points
+            
+            if used < len(items):
+                # Reuse an item left over from the previous frame
+                self.canvas.coords(items[used], *coords)
+                self.canvas.itemconfigure(items[used], fill=stroke["color"])
+            else:
+                items.append(self.canvas.create_line(
+                    *coords,
+                    width=line_width,
+                    fill=stroke["color"], 
+                    smooth=True,
+                    capstyle=tk.ROUND,
+                    joinstyle=tk.ROUND
+                ))
+            used += 1
+        
+        # Delete the items this frame has no stroke for
+        for item in items[used:]:
+            self.canvas.delete(item)
+        del items[used:]
+    
     def stop_animation(self):
         """Stop animation playback and restore drawing state"""
         if not self.animation_running:
             return
         
         self.animation_running = False
+        self.animation_photos = None  # Free the prerendered frames
         
         # Update button states
         self.play_btn.config(state=tk.NORMAL)  # Re-enable play button
@@ -1455,8 +2038,8 @@ class OptiflowApp:
             self.current_keyframe = self.animation_current_frame
             self.keyframe_var.set(str(self.current_keyframe))
             
-            # Restore strokes from saved state before animation
-            self.strokes = copy.deepcopy(self.animation_current_strokes)
+            # Restore strokes from saved state before animation - hand the saved list back, no copy
+            self.strokes = self.animation_current_strokes
             
             # Clean up saved state to free memory
             del self.animation_current_strokes
@@ -1478,30 +2061,54 @@ class OptiflowApp:
         frame_nums = sorted(self.keyframes.keys())
         
         try:
-            for frame_num in frame_nums:
-                # Create image at full resolution (1920x1080)
-                img = Image.new('RGB', (self.canvas_width, self.canvas_height), color='white')
-                
-                # Create a higher resolution image for anti-aliasing
-                img_high_res = img.resize((self.canvas_width * 4, self.canvas_height * 4), Image.Resampling.LANCZOS)
-                draw = ImageDraw.Draw(img_high_res)
-                
-                # Draw strokes with anti-aliasing by drawing at higher resolution
-                strokes = self.keyframes[frame_num]
-                for stroke in strokes:
-                    for i in range(len(stroke) - 1):
-                        # Scale coordinates to higher resolution
-                        x1, y1 = stroke[i][0] * 4, stroke[i][1] * 4
-                        x2, y2 = stroke[i+1][0] * 4, stroke[i+1][1] * 4
-                        draw.line([x1, y1, x2, y2], fill=self.pencil_color, width=8)  # 2 * 4 for higher resolution
-                
-                # Resize back to original size with anti-aliasing
-                img = img_high_res.resize((self.canvas_width, self.canvas_height), Image.Resampling.LANCZOS)
-                
-                # Save frame
-                filename = os.path.join(export_dir, f"frame_{frame_num:04d}.png")
-                img.save(filename)
-                logger.info(f"Saved frame {frame_num} to {filename}")
+            import concurrent.futures
+            import itertools
+            import multiprocessing
+            import queue
+            import threading
+            
+            # Frames are independent, so render them on one worker process per core.
+            # Workers only get the point arrays, colors and widths of the strokes.
+            frame_strokes = [
+                [(stroke["pts"], stroke["color"], stroke["width"]) for stroke in self.keyframes[frame_num]]
+                for frame_num in frame_nums
+            ]
+            size = (self.canvas_width, self.canvas_height)
+            workers = max(1, min(len(frame_nums), os.cpu_count() or 1))
+            
+            # Files are written on a background thread while the next frames are still rendering
+            write_queue = queue.Queue(maxsize=4)
+            write_errors = []
+            
+            def write_frames():
+                while True:
+                    item = write_queue.get()
+                    if item is None:
+                        return
+                    filename, png_data = item
+                    try:
+                        with open(filename, "wb") as f:
+                            f.write(png_data)
+                        logger.info(f"Saved frame to {filename}")
+                    except OSError as e:
+                        write_errors.append(e)
+            
+            writer = threading.Thread(target=write_frames, daemon=True)
+            writer.start()
+            try:
+                # Spawned, not forked: forking a process running Tk, OpenCV and Numba threads can deadlock
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    rendered = executor.map(_render_export_frame, frame_strokes,
+                                            itertools.repeat(size), itertools.repeat(self.export_supersample))
+                    for frame_num, png_data in zip(frame_nums, rendered):
+                        # Save frame
+                        write_queue.put((os.path.join(export_dir, f"frame_{frame_num:04d}.png"), png_data))
+            finally:
+                # Let the writer finish the queued frames, then stop it
+                write_queue.put(None)
+                writer.join()
+            if write_errors:
+                raise write_errors[0]
             
             self.status_var.set(f"Exported {len(frame_nums)} frames at {self.canvas_width}x{self.canvas_height} to {export_dir}")
             messagebox.showinfo("Success", f"Exported {len(frame_nums)} frames at {self.canvas_width}x{self.canvas_height}")
@@ -1515,7 +2122,7 @@ class OptiflowApp:
             frame_num = self.current_keyframe
             
             # Save strokes explicitly for this frame
-            self.keyframes[frame_num] = copy.deepcopy(self.strokes)
+            self.keyframes[frame_num] = _clone_strokes(self.strokes)
             logger.info(f"Saved {len(self.strokes)} strokes for keyframe {frame_num}")
             
             # Update status
@@ -1529,21 +2136,22 @@ class OptiflowApp:
     
 
     def copy_strokes(self, event=None):
-        """Copy current strokes to clipboard in both internal format and JSON for external apps"""
+        """Copy current strokes to clipboard in both internal format and text for external apps"""
         if not self.strokes:
             self.status_var.set("Nothing to copy")
             return "break"
         
         try:
-            # Copy strokes to internal clipboard
-            self.clipboard = copy.deepcopy(self.strokes)
+            # Copy strokes to internal clipboard - finished strokes are read-only, so share them
+            self.clipboard = _clone_strokes(self.strokes)
             
-            # Convert strokes to JSON format for external clipboard
-            json_strokes = json.dumps(self.strokes)
+            # Convert strokes to text for the external clipboard
+            clipboard_text = self.strokes_to_clipboard_text(self.strokes)
+            self.clipboard_text = clipboard_text
             
-            # Use Tkinter clipboard to store JSON data
+            # Use Tkinter clipboard to store the text
             self.root.clipboard_clear()
-            self.root.clipboard_append(json_strokes)
+            self.root.clipboard_append(clipboard_text)
             
             self.status_var.set(f"Copied {len(self.strokes)} strokes to clipboard")
         except Exception as e:
@@ -1552,34 +2160,26 @@ class OptiflowApp:
     def paste_strokes(self, event=None):
         """Paste strokes from clipboard, handling both internal and external formats"""
         try:
-            # Try to get JSON data from external clipboard
-            json_data = self.root.clipboard_get()
-            paste_strokes = json.loads(json_data)
-            
-            # Process the strokes to ensure valid format
-            processed_strokes = []
-            for stroke in paste_strokes:
-                if not isinstance(stroke, list):
-                    continue
-                
-                new_stroke = []
-                for point in stroke:
-                    # Handle both tuple and list formats for points
-                    if isinstance(point, (list, tuple)) and len(point) >= 2:
-                        try:
-                            x, y = float(point[0]), float(point[1])
-                            new_stroke.append((x, y))
-                        except (ValueError, TypeError):
-                            # Skip invalid points
-                            continue
-                
-                if len(new_stroke) > 1:  # Only add if it's a valid stroke
-                    processed_strokes.append(new_stroke)
+            # Try to get stroke data from external clipboard
+            clipboard_text = self.root.clipboard_get()
+            
+            if self.clipboard is not None and clipboard_text == self.clipboard_text:
+                # Still our own copy - reuse the read-only point arrays instead of parsing
+                processed_strokes = [dict(stroke) for stroke in self.clipboard]
+            elif self.parsed_clipboard is not None and clipboard_text == self.parsed_clipboard[0]:
+                # Pasting the same external text again - reuse what it parsed to last time
+                processed_strokes = [dict(stroke) for stroke in self.parsed_clipboard[1]]
+            else:
+                if clipboard_text.startswith(self.clipboard_prefix):
+                    processed_strokes = self.parse_strokes_binary(clipboard_text)
+                else:
+                    processed_strokes = self.parse_strokes_json(clipboard_text)
+                self.parsed_clipboard = (clipboard_text, processed_strokes)
             
             # Add processed strokes to current strokes
             if processed_strokes:
                 self.strokes.extend(processed_strokes)
-                self.save_state()
+                self.push_op({"op": "add", "strokes": processed_strokes})
                 self.redraw_canvas()
                 
                 num_strokes = len(processed_strokes)
@@ -1590,26 +2190,87 @@ class OptiflowApp:
             self.status_var.set(f"Error pasting strokes: {str(e)}")
         return "break"
     
+    def strokes_to_clipboard_text(self, strokes):
+        """Clipboard text for strokes: JSON point lists, or compact base64 binary for large copies"""
+        if sum(len(stroke["pts"]) for stroke in strokes) <= self.max_json_clipboard_points:
+            import json  # Only needed for clipboard text
+            return json.dumps([stroke["pts"].tolist() for stroke in strokes])
+        
+        # Stroke count, the point count of each stroke, then all points as little-endian float32
+        import base64  # Only needed for large copies
+        lengths = np.array([len(stroke["pts"]) for stroke in strokes], dtype="<i4")
+        packed = np.concatenate([stroke["pts"] for stroke in strokes]).astype("<f4")
+        data = np.array([len(strokes)], dtype="<i4").tobytes() + lengths.tobytes() + packed.tobytes()
+        return self.clipboard_prefix + base64.b64encode(data).decode("ascii")
+    
+    def parse_strokes_binary(self, text):
+        """Parse strokes from the compact clipboard text written for large copies"""
+        import base64  # Only needed for large copies
+        data = base64.b64decode(text[len(self.clipboard_prefix):], validate=True)
+        
+        # Unpack the layout written by strokes_to_clipboard_text, checking the sizes agree
+        count = int(np.frombuffer(data, dtype="<i4", count=1)[0])
+        lengths = np.frombuffer(data, dtype="<i4", count=count, offset=4)
+        pts = np.frombuffer(data, dtype="<f4", offset=4 + 4 * count).reshape(-1, 2)
+        if count < 1 or lengths.min() < 0 or int(lengths.sum()) != len(pts):
+            raise ValueError("Malformed stroke data")
+        
+        return [self.make_stroke(piece) for piece in np.split(pts, np.cumsum(lengths)[:-1]) if len(piece) > 1]
+    
+    def parse_strokes_json(self, json_data):
+        """Parse strokes from JSON clipboard text, skipping anything that isn't a valid stroke"""
+        import json  # Only needed for clipboard text
+        paste_strokes = json.loads(json_data)
+        
+        # Process the strokes to ensure valid format
+        processed_strokes = []
+        for stroke in paste_strokes:
+            if not isinstance(stroke, list):
+                continue
+            
+            # Fast path: a well-formed stroke converts to an (N, 2+) array in one call
+            try:
+                arr = np.asarray(stroke, dtype=np.float64)
+                if arr.ndim == 2 and arr.shape[1] >= 2:
+                    if len(arr) > 1:  # Only add if it's a valid stroke
+                        processed_strokes.append(self.make_stroke(arr[:, :2]))
+                    continue
+            except (ValueError, TypeError):
+                pass  # Ragged or mixed points - check them one at a time below
+            
+            new_stroke = []
+            for point in stroke:
+                # Handle both tuple and list formats for points
+                if isinstance(point, (list, tuple)) and len(point) >= 2:
+                    try:
+                        x, y = float(point[0]), float(point[1])
+                        new_stroke.append((x, y))
+                    except (ValueError, TypeError):
+                        # Skip invalid points
+                        continue
+            
+            if len(new_stroke) > 1:  # Only add if it's a valid stroke
+                processed_strokes.append(self.make_stroke(new_stroke))
+        
+        return processed_strokes
+    
     def on_window_resize(self, event=None):
         """Handle window resize to ensure canvas stays centered"""
-        # We only care about resize events for the window, not other widgets
+        # <Configure> fires for every widget and every pixel of a window drag, so this
+        # must stay cheap: the canvas keeps its size and the pack manager with
+        # expand=True and anchor=CENTER recentres it, so nothing is redrawn here
         if event.widget == self.root:
-            # No need to resize the canvas, just ensure it's centered
-            # The pack manager with expand=True and anchor=CENTER handles this automatically
             pass
     
     def erase_at_point(self, canvas_x, canvas_y):
         """Erase strokes near the specified point"""
-        # Save state before first erase operation
-        if not hasattr(self, 'erase_state_saved') or not self.erase_state_saved:
-            self.save_state()
-            self.erase_state_saved = True
-        
         # Scale the eraser radius for display coordinates, accounting for zoom
         eraser_radius = self.eraser_size / 2  # Eraser size is the diameter
-        display_radius = eraser_radius * self.scale_factor * self.zoom_factor
-        display_x = canvas_x * self.scale_factor * self.zoom_factor
-        display_y = canvas_y * self.scale_factor * self.zoom_factor
+        eraser_radius_sq = eraser_radius * eraser_radius  # Hits are tested on squared distances, no sqrt
+        display_scale = self.display_scale
+        display_radius = eraser_radius * display_scale
+        display_x = canvas_x * display_scale
+        display_y = canvas_y * display_scale
         
         # Draw visual feedback of eraser directly using display coordinates
         eraser_outline = self.canvas.create_oval(
@@ -1622,64 +2283,75 @@ class OptiflowApp:
         )
         self.canvas.after(100, lambda: self.canvas.delete(eraser_outline))
         
-        # Check each stroke
-        modified = False
-        new_strokes = []
-        for stroke in self.strokes:
-            # Check if any point in the stroke is within eraser radius
-            points_to_remove = []
-            for i, point in enumerate(stroke):
-                dist = ((point[0] - canvas_x)**2 + (point[1] - canvas_y)**2)**0.5
-                if dist <= eraser_radius:
-                    points_to_remove.append(i)
-                modified = True
-            
-            # Convert to continuous ranges to handle split properly
-            if points_to_remove:
-                ranges = []
-                start = points_to_remove[0]
-                end = start
-                for i in range(1, len(points_to_remove)):
-                    if points_to_remove[i] == end + 1:
-                        end = points_to_remove[i]
-                    else:
-                        ranges.append((start, end))
-                        start = points_to_remove[i]
-                        end = start
-                ranges.append((start, end))
-                
-                # Handle each continuous range
-                last_end = -1
-                segments = []
-                for start, end in ranges:
-                    # Add segment before this range if it exists and has enough points
-                    if start > last_end + 1:
-                        segment = stroke[last_end+1:start]
-                        if len(segment) > 1:
-                            segments.append(segment)
-                    last_end = end
-                
-                # Add final segment after the last removed range
-                if last_end < len(stroke) - 1:
-                    segment = stroke[last_end+1:]
-                    if len(segment) > 1:
-                        segments.append(segment)
-                
-                # Add valid segments to new strokes
-                new_strokes.extend(segments)
-            else:
-                # If no points were affected, keep the whole stroke
-                new_strokes.append(stroke)
+        # Check each stroke, collecting a modify operation for every stroke that is hit
+        center = np.array([canvas_x, canvas_y], dtype=np.float32)
+        left, right = canvas_x - eraser_radius, canvas_x + eraser_radius
+        top, bottom = canvas_y - eraser_radius, canvas_y + eraser_radius
+        modify_ops = []
+        for index, stroke in enumerate(self.strokes):
+            # Skip strokes whose bounding box is nowhere near the eraser
+            xmin, ymin, xmax, ymax = stroke["bbox"]
+            if xmax < left or xmin > right or ymax < top or ymin > bottom:
+                continue
+            
+            # Check which points of the stroke are within eraser radius
+            pts = stroke["pts"]
+            offsets = pts - center
+            dist_sq = np.einsum("ij,ij->i", offsets, offsets)  # Row-wise dot product, no squared temporaries
+            points_to_remove = np.flatnonzero(dist_sq <= eraser_radius_sq)
+            if not len(points_to_remove):
+                continue
+            
+            # Split at every erased point; each piece after the first starts with an erased point
+            pieces = np.split(pts, points_to_remove)
+            pieces = [pieces[0]] + [piece[1:] for piece in pieces[1:]]
+            
+            # Keep the pieces that still have enough points to be a stroke
+            segments = [
+                self.make_stroke(piece.copy(), stroke["color"], stroke["width"])
+                for piece in pieces if len(piece) > 1
+            ]
+            
+            # Replace the stroke with its remaining segments
+            modify_ops.append({"op": "modify", "index": index, "before": stroke, "after": segments})
         
-        if modified:
-            self.strokes = new_strokes
-            self.keyframes[self.current_keyframe] = copy.deepcopy(self.strokes)
-            self.redraw_canvas()
+        if modify_ops:
+            # Replace only the line items of the strokes that were hit, if they are in step
+            update_items = len(self.stroke_items) == len(self.strokes)
+            
+            # Apply from the highest index down so earlier indices stay valid
+            modify_ops.reverse()
+            for op in modify_ops:
+                self._apply_op(op)
+                if update_items:
+                    i = op["index"]
+                    old_item = self.stroke_items[i]
+                    new_items = [self.create_stroke_item(stroke) for stroke in op["after"]]
+                    for item in new_items:
+                        self.canvas.tag_lower(item, old_item)  # Keep the stacking order
+                    self.canvas.delete(old_item)
+                    self.stroke_items[i:i + 1] = new_items
+            
+            # A whole eraser drag is recorded as a single undo step
+            if self.erase_op is not None and self.history and self.history[-1] is self.erase_op:
+                self.erase_op["ops"].extend(modify_ops)
+                self.history_points += sum(self._op_point_count(op) for op in modify_ops)
+                self._trim_history()
+            else:
+                self.erase_op = {"op": "group", "ops": modify_ops}
+                self.push_op(self.erase_op)
+            
+            self.keyframes[self.current_keyframe] = _clone_strokes(self.strokes)
+            if not update_items:
+                self.redraw_canvas()
     
 
 
 
 if __name__ == "__main__":
+    # Configure logging for debugging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     root = tk.Tk()
     app = OptiflowApp(root)
     root.mainloop()
\ No newline at end of file